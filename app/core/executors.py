@@ -0,0 +1,118 @@
+# app/core/executors.py
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Threads for blocking SDK calls (Firebase Admin, token verification)
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "8"))
+
+# bcrypt work factor; hashing can optionally run in a process pool to keep the GIL free
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_PROCESS_POOL = os.getenv("BCRYPT_PROCESS_POOL", "false").lower() in ("1", "true", "yes")
+BCRYPT_PROCESS_WORKERS = int(os.getenv("BCRYPT_PROCESS_WORKERS", "2"))
+
+
+class PoolStats:
+    """Queue depth and latency for one executor (updated on the event loop thread)."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+
+    def finished(self, wait: float, run: float, ok: bool) -> None:
+        self.completed += 1
+        self.failed += 0 if ok else 1
+        self.wait_seconds_total += wait
+        self.run_seconds_total += run
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            # FIFO pool: anything beyond the worker count is waiting for a slot
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_seconds": self.wait_seconds_total / done,
+            "avg_run_seconds": self.run_seconds_total / done,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+def _timed_call(submitted_at: float, fn: Callable, *args, **kwargs) -> Tuple[Any, float, float]:
+    # Runs inside the worker; wall-clock time so it also works across processes
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+_thread_pool = ThreadPoolExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="blocking")
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+thread_pool_stats = PoolStats("blocking", BLOCKING_POOL_SIZE)
+bcrypt_pool_stats = PoolStats("bcrypt", BCRYPT_PROCESS_WORKERS if BCRYPT_PROCESS_POOL else BLOCKING_POOL_SIZE)
+
+
+async def _run(executor: Executor, stats: PoolStats, fn: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    submitted_at = time.time()
+    stats.in_flight += 1
+    try:
+        result, wait, run = await loop.run_in_executor(executor, partial(_timed_call, submitted_at, fn, *args, **kwargs))
+    except Exception:
+        stats.finished(time.time() - submitted_at, 0.0, ok=False)
+        raise
+    finally:
+        stats.in_flight -= 1
+    stats.finished(wait, run, ok=True)
+    return result
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call (Firebase Admin SDK etc.) on the dedicated thread pool."""
+    return await _run(_thread_pool, thread_pool_stats, fn, *args, **kwargs)
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+async def hash_password(password: str) -> str:
+    global _process_pool
+    executor: Executor = _thread_pool
+    if BCRYPT_PROCESS_POOL:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=BCRYPT_PROCESS_WORKERS)
+        executor = _process_pool
+    return await _run(executor, bcrypt_pool_stats, _hash_password, password, BCRYPT_ROUNDS)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        thread_pool_stats.name: thread_pool_stats.snapshot(),
+        bcrypt_pool_stats.name: bcrypt_pool_stats.snapshot(),
+    }
+
+
+def shutdown_executors() -> None:
+    global _process_pool
+    _thread_pool.shutdown(wait=False, cancel_futures=True)
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
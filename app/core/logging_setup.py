@@ -0,0 +1,178 @@
+# app/core/logging_setup.py
+"""
+Structured JSON logging. Request code only enqueues records; a background
+QueueListener thread formats and writes them, so a slow stdout never blocks
+the event loop.
+
+Env:
+  LOG_LEVEL               root level (default INFO)
+  LOG_LEVELS              per-logger overrides, e.g. "app.routes.merge_audio=DEBUG,httpx=WARNING"
+  LOG_FORMAT              json (default) or text
+  LOG_DEBUG_SAMPLE_RATE   fraction of DEBUG records kept (default 0.01)
+  LOG_MAX_FIELD_CHARS     longer messages/fields are truncated (default 512)
+"""
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "512"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+REDACTED = "[REDACTED]"
+
+# Extra fields whose values are never logged
+SENSITIVE_KEYS = {"authorization", "token", "idtoken", "id_token", "password", "xi-api-key", "api_key", "cookie"}
+
+# Bearer headers and JWTs (Firebase ID tokens) anywhere in a message
+_TOKEN_PATTERN = re.compile(r"(Bearer\s+)[\w\-.~+/]+=*|eyJ[\w-]+\.[\w-]+\.[\w-]*", re.IGNORECASE)
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+# -----------------------------
+# 🔹 Redaction / truncation
+# -----------------------------
+def _truncate(text: str) -> str:
+    if len(text) <= LOG_MAX_FIELD_CHARS:
+        return text
+    return f"{text[:LOG_MAX_FIELD_CHARS]}…(+{len(text) - LOG_MAX_FIELD_CHARS} chars)"
+
+
+def redact_text(text: str) -> str:
+    return _TOKEN_PATTERN.sub(lambda m: (m.group(1) or "") + REDACTED, text)
+
+
+def redact_value(value: Any, depth: int = 0) -> Any:
+    """Makes an extra field safe to log: secrets masked, payloads bounded."""
+    if isinstance(value, dict):
+        if depth >= 2:
+            return f"<dict with {len(value)} keys>"
+        return {
+            str(k): REDACTED if str(k).lower() in SENSITIVE_KEYS else redact_value(v, depth + 1)
+            for k, v in list(value.items())[:20]
+        }
+    if isinstance(value, (list, tuple)):
+        if depth >= 2 or len(value) > 20:
+            return f"<{type(value).__name__} of {len(value)} items>"
+        return [redact_value(v, depth + 1) for v in value]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _truncate(redact_text(str(value)))
+
+
+# -----------------------------
+# 🔹 Filters / handlers
+# -----------------------------
+class DebugSampler(logging.Filter):
+    """Keeps only a fraction of DEBUG records; INFO and above always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class RedactingQueueHandler(QueueHandler):
+    """Renders and redacts the record on the caller's side, then hands it to the listener thread."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # never block the event loop on logging
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)  # merges args into msg, drops exc_info after formatting it
+        record.msg = redact_text(record.msg)
+        if record.levelno < logging.ERROR:  # keep full tracebacks
+            record.msg = _truncate(record.msg)
+        for key in set(vars(record)) - _RECORD_ATTRS:
+            value = getattr(record, key)
+            setattr(record, key, REDACTED if key.lower() in SENSITIVE_KEYS else redact_value(value))
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in set(vars(record)) - _RECORD_ATTRS:
+            entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# -----------------------------
+# 🔹 Setup / teardown (called from the FastAPI lifespan)
+# -----------------------------
+_listener: Optional[QueueListener] = None
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    # Bounded: if stdout can't keep up, records are dropped instead of memory growing
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = RedactingQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,249 @@
+# app/core/metrics.py
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format
+(or OpenMetrics, which adds exemplars such as ElevenLabs request-ids).
+Everything is updated on the event loop thread, so no locking is needed.
+"""
+import bisect
+import logging
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers cached auth lookups (ms) up to long TTS renders
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self, openmetrics: bool) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count; exposed as <name>_total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name.removesuffix("_total"), documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def header(self, openmetrics: bool) -> List[str]:
+        # OpenMetrics names the family without the suffix; the Prometheus format uses the sample name
+        family = self.name if openmetrics else f"{self.name}_total"
+        return [f"# HELP {family} {self.documentation}", f"# TYPE {family} counter"]
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        return [
+            f"{self.name}_total{_labels(self.labelnames, key)} {_number(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Cumulative buckets + sum + count. Exemplars (latest per bucket) only appear in OpenMetrics output."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+        self._exemplars: Dict[LabelValues, Dict[int, Tuple[Dict[str, str], float, float]]] = {}
+
+    def observe(self, value: float, exemplar: Optional[Dict[str, str]] = None, **labels) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * len(self.buckets)
+            self._sums[key] = 0.0
+        index = bisect.bisect_left(self.buckets, value)
+        counts[index] += 1
+        self._sums[key] += value
+        if exemplar:
+            self._exemplars.setdefault(key, {})[index] = (exemplar, value, time.time())
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        lines: List[str] = []
+        names = self.labelnames + ("le",)
+        for key, counts in self._counts.items():
+            exemplars = self._exemplars.get(key, {}) if openmetrics else {}
+            cumulative = 0
+            for index, (bound, count) in enumerate(zip(self.buckets, counts)):
+                cumulative += count
+                line = f"{self.name}_bucket{_labels(names, key + (_number(bound),))} {cumulative}"
+                if index in exemplars:
+                    ex_labels, ex_value, ex_time = exemplars[index]
+                    line += f" # {_labels(tuple(ex_labels), tuple(ex_labels.values()))} {_number(ex_value)} {ex_time:.3f}"
+                lines.append(line)
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(self._sums[key])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+# A collector returns metrics built at scrape time (e.g. from cache stats() snapshots)
+Collector = Callable[[], List[_Metric]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self, openmetrics: bool = False) -> str:
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+
+        lines: List[str] = []
+        for metric in metrics:
+            samples = metric.samples(openmetrics)
+            if samples:
+                lines.extend(metric.header(openmetrics))
+                lines.extend(samples)
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# -----------------------------
+# 🔹 Metrics shared across the app
+# -----------------------------
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+stage_duration = registry.histogram(
+    "stage_duration_seconds",
+    "Time spent in one stage of request handling (token_verify, mongo_user_lookup, gpt, tts, silence, concat, ffmpeg_concat, response).",
+    ("stage",),
+)
+outbound_in_flight = registry.gauge("outbound_requests_in_flight", "Outbound API calls currently open.", ("service",))
+outbound_errors = registry.counter("outbound_request_errors_total", "Failed outbound API calls.", ("service",))
+
+
+@contextmanager
+def time_stage(stage: str, exemplar: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Times a block into stage_duration_seconds. The yielded dict can be filled
+    inside the block (e.g. with an ElevenLabs request_id) to attach an exemplar.
+    """
+    exemplar = dict(exemplar or {})
+    started = time.perf_counter()
+    try:
+        yield exemplar
+    finally:
+        stage_duration.observe(time.perf_counter() - started, exemplar=exemplar or None, stage=stage)
@@ -1,35 +1,95 @@
 import os
 import time
+from typing import Any, Dict, NamedTuple
 from fastapi import HTTPException, Request
 from firebase_admin import auth as admin_auth
+
+from app.core.executors import run_blocking
+from app.core.token_cache import TokenCache
+from app.services.user_service import get_user_by_uid
+
 MAX_CLOCK_SKEW_SECONDS = 5
 
-# ✅ Decode Firebase token only
-def decode_firebase_token(token: str):
-    try:
-        decoded_token = admin_auth.verify_id_token(token)  
-
-          # Manually allow small clock skew
-        now = int(time.time())
-        if "iat" in decoded_token and decoded_token["iat"] > now + MAX_CLOCK_SKEW_SECONDS:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid Firebase token: Token issued in the future (clock skew).",
-            )
-        
-        return {"uid": decoded_token["uid"], "email": decoded_token.get("email")}
-    
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {e}")
-
-# ✅ Extract Firebase token from request headers
-def get_current_user(request: Request):
+# Verified-token cache shared by the middleware, /api/user and /api/login
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# Ask Firebase whether the user's tokens were revoked (sign-out everywhere on any replica)
+# on every cache miss; a revocation is then seen within TOKEN_CACHE_TTL_SECONDS everywhere
+TOKEN_CHECK_REVOKED = os.getenv("TOKEN_CHECK_REVOKED", "true").lower() in ("1", "true", "yes")
+
+token_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS)
+
+
+# ✅ Verify Firebase ID token (cached; RSA verify runs off the event loop)
+async def verify_id_token_cached(token: str) -> dict:
+    decoded_token = token_cache.get(token)
+    if decoded_token is not None:
+        return decoded_token
+
+    decoded_token = await run_blocking(admin_auth.verify_id_token, token, check_revoked=TOKEN_CHECK_REVOKED)
+
+    # Manually allow small clock skew
+    now = int(time.time())
+    if "iat" in decoded_token and decoded_token["iat"] > now + MAX_CLOCK_SKEW_SECONDS:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid Firebase token: Token issued in the future (clock skew).",
+        )
+
+    if token_cache.is_revoked(token, decoded_token):
+        raise HTTPException(status_code=401, detail="Invalid Firebase token: Token has been revoked.")
+
+    token_cache.put(token, decoded_token)
+    return decoded_token
+
+
+# ✅ Revocation hooks (sign-out, sign-out everywhere)
+def revoke_token(token: str, claims: Dict[str, Any]):
+    token_cache.revoke_token(token, claims)
+
+
+def revoke_user_tokens(uid: str):
+    token_cache.revoke_uid(uid)
+
+
+# ✅ Extract bearer token from request headers
+def get_bearer_token(request: Request) -> str:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing Authorization header")
+    return auth_header.split(" ")[1]
+
+
+# ✅ Per-request auth context: decoded claims + Mongo user document
+class AuthContext(NamedTuple):
+    claims: Dict[str, Any]
+    user: Dict[str, Any]
+
+    @property
+    def uid(self) -> str:
+        return self.claims["uid"]
+
 
-    token = auth_header.split(" ")[1]
+async def get_auth_context(request: Request) -> AuthContext:
+    """
+    FastAPI dependency. Reuses what FirebaseAuthMiddleware already attached to
+    request.state; only verifies / looks up on routes the middleware skips.
+    """
+    claims = getattr(request.state, "claims", None)
+    if claims is None:
+        token = get_bearer_token(request)
+        try:
+            claims = await verify_id_token_cached(token)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {e}")
 
-    print("🔑 Incoming Firebase token (first 50 chars):", token[:50])  # DEBUG
+    user = getattr(request.state, "user", None)
+    if user is None:
+        user = await get_user_by_uid(claims["uid"])
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    return decode_firebase_token(token)
+    return AuthContext(claims=claims, user=user)
@@ -0,0 +1,89 @@
+# app/core/token_cache.py
+import hashlib
+import time
+from typing import Any, Dict, Optional, Set
+
+from app.utils.ttl_cache import TTLCache
+
+
+# Firebase ID tokens are valid for one hour; older revocation records can't match anything
+MAX_TOKEN_LIFETIME_SECONDS = 3600
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified Firebase ID-token claims, keyed by token hash.
+
+    Entries expire at the token's own `exp` or after `ttl_seconds`, whichever
+    comes first. `revoke_token` remembers the token's hash until it expires,
+    and `revoke_uid` makes every token of a user issued before the revocation
+    fail `is_revoked`. Revocations are per process.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # token key -> claims; expiry is on the wall clock to line up with `exp`
+        self._entries = TTLCache(max_entries, ttl_seconds, clock=time.time, on_evict=self._forget)
+        self._keys_by_uid: Dict[str, Set[str]] = {}
+        self._revoked_at: Dict[str, float] = {}
+        # token key -> exp, kept until the token would have expired anyway
+        self._revoked_tokens: Dict[str, float] = {}
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(_token_key(token))
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        key = _token_key(token)
+        uid = claims.get("uid")
+        if uid:
+            self._keys_by_uid.setdefault(uid, set()).add(key)
+        self._entries.put(key, claims, min(float(claims.get("exp", 0)), time.time() + self.ttl_seconds))
+        if key not in self._entries:
+            self._forget(key, claims)  # already expired, never stored
+
+    # -----------------------------
+    # Revocation hooks
+    # -----------------------------
+    def revoke_token(self, token: str, claims: Dict[str, Any]) -> None:
+        """Reject `token` (with its verified `claims`) from now until its `exp`."""
+        key = _token_key(token)
+        self._entries.pop(key)
+        self._revoked_tokens[key] = float(claims.get("exp", time.time() + MAX_TOKEN_LIFETIME_SECONDS))
+        self._prune_revocations()
+
+    def revoke_uid(self, uid: str) -> None:
+        """Forget all cached tokens for `uid` and reject tokens issued before now."""
+        for key in list(self._keys_by_uid.get(uid, ())):
+            self._entries.pop(key)
+        self._revoked_at[uid] = time.time()
+        self._prune_revocations()
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        if _token_key(token) in self._revoked_tokens:
+            return True
+        revoked_at = self._revoked_at.get(claims.get("uid"))
+        return revoked_at is not None and claims.get("iat", 0) <= revoked_at
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+    def _prune_revocations(self) -> None:
+        now = time.time()
+        for key in [k for k, exp in self._revoked_tokens.items() if exp <= now]:
+            del self._revoked_tokens[key]
+        for uid in [u for u, at in self._revoked_at.items() if now - at > MAX_TOKEN_LIFETIME_SECONDS]:
+            del self._revoked_at[uid]
+
+    def _forget(self, key: str, claims: Dict[str, Any]) -> None:
+        uid = claims.get("uid")
+        keys = self._keys_by_uid.get(uid)
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uid[uid]
@@ -1,4 +1,4 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from dotenv import load_dotenv
 import os
 
@@ -14,3 +14,8 @@ db = client["mme-mvp"]  # Your DB name
 users_collection = db["users"]
 answers_collection = db["answers"]
 core_settings_collection = db["elevenLabsSettings"]
+merge_jobs_collection = db["mergeJobs"]
+
+# GridFS bucket for rendered job audio (results can exceed the 16 MB document limit)
+merge_audio_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="mergeAudio")
+gpt_cache_collection = db["gptResponseCache"]
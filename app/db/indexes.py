@@ -0,0 +1,116 @@
+# app/db/indexes.py
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from app.db.db import answers_collection, gpt_cache_collection, merge_jobs_collection, users_collection
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# warn → log problems and keep starting, fail → abort startup, off → skip the explain() check
+INDEX_CHECK_MODE = os.getenv("INDEX_CHECK_MODE", "warn").lower()
+
+# -----------------------------
+# 🔹 Declared indexes, per collection
+# -----------------------------
+INDEXES: List[Tuple[Any, List[IndexModel]]] = [
+    (users_collection, [
+        # Partial so legacy documents without a uid / email don't collide on null
+        IndexModel(
+            [("uid", ASCENDING)],
+            name="uid_unique",
+            unique=True,
+            partialFilterExpression={"uid": {"$type": "string"}},
+        ),
+        IndexModel(
+            [("email", ASCENDING)],
+            name="email_unique",
+            unique=True,
+            partialFilterExpression={"email": {"$type": "string"}},
+        ),
+    ]),
+    (answers_collection, [
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING)], name="userId_createdAt"),
+        # Keyset pagination of a user's submissions (GET /api/submissions)
+        IndexModel([("userId", ASCENDING), ("_id", DESCENDING)], name="userId_id"),
+        # Makes client retries of the same submission a no-op
+        IndexModel(
+            [("userId", ASCENDING), ("idempotencyKey", ASCENDING)],
+            name="userId_idempotencyKey_unique",
+            unique=True,
+            partialFilterExpression={"idempotencyKey": {"$type": "string"}},
+        ),
+    ]),
+    (gpt_cache_collection, [
+        # Mongo drops cached completions itself once expiresAt passes
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+    ]),
+    (merge_jobs_collection, [
+        # Not a TTL index: the janitor must delete the GridFS audio along with the job
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt"),
+    ]),
+]
+
+
+# -----------------------------
+# 🔹 Hot queries that must be served by an index
+# -----------------------------
+def _hot_queries() -> List[Tuple[str, Any, Dict[str, Any], Dict[str, Any]]]:
+    return [
+        ("users by uid", users_collection, {"uid": "__index_check__"}, {}),
+        ("users by email", users_collection, {"email": "__index_check__"}, {}),
+        ("answers by userId", answers_collection, {"userId": "__index_check__"}, {"sort": [("createdAt", DESCENDING)]}),
+        ("answers page", answers_collection, {"userId": "__index_check__"}, {"sort": [("_id", DESCENDING)]}),
+        ("expired merge jobs", merge_jobs_collection, {"expiresAt": {"$lt": datetime.utcnow()}}, {}),
+    ]
+
+
+def _has_collscan(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(v) for v in plan)
+    return False
+
+
+def _report(problem: str) -> None:
+    if INDEX_CHECK_MODE == "fail":
+        raise RuntimeError(problem)
+    logger.warning(problem)
+
+
+async def verify_query_plans() -> None:
+    for label, collection, query, options in _hot_queries():
+        cursor = collection.find(query)
+        if options.get("sort"):
+            cursor = cursor.sort(options["sort"])
+        try:
+            plan = await cursor.explain()
+        except PyMongoError as e:
+            _report(f"explain() failed for '{label}': {e}")
+            continue
+        winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+        if _has_collscan(winning):
+            _report(f"Query '{label}' on {collection.name} uses a COLLSCAN")
+
+
+async def ensure_indexes() -> None:
+    """Creates the declared indexes (no-op when they exist) and checks the hot query plans."""
+    for collection, models in INDEXES:
+        try:
+            await collection.create_indexes(models)
+        except PyMongoError as e:
+            # e.g. duplicate emails already stored → the unique index can't be built
+            _report(f"Failed to create indexes on {collection.name}: {e}")
+
+    if INDEX_CHECK_MODE != "off":
+        await verify_query_plans()
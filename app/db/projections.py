@@ -0,0 +1,43 @@
+# app/db/projections.py
+"""
+Named inclusion projections for the users collection. Each read path asks
+only for the fields it renders, so the password hash and any profile data
+added later never travel unless a path opts in.
+"""
+
+# POST /login response
+LOGIN_PROJECTION = {
+    "_id": 0,
+    "uid": 1,
+    "email": 1,
+    "firstName": 1,
+    "lastName": 1,
+    "photoURL": 1,
+    "isGoogleUser": 1,
+}
+
+# GET/PUT /api/user (lastSyncedAt gates the Google profile refresh)
+PROFILE_PROJECTION = {
+    **LOGIN_PROJECTION,
+    "dob": 1,
+    "age": 1,
+    "gender": 1,
+    "lastSyncedAt": 1,
+}
+
+# User attached to every authenticated request by the middleware / get_auth_context
+AUTH_CONTEXT_PROJECTION = {
+    "_id": 0,
+    "uid": 1,
+    "email": 1,
+    "name": 1,
+    "displayName": 1,
+    "photoURL": 1,
+    "isGoogleUser": 1,
+}
+
+# Auth-context lookup on the /api/user routes: identity and profile fields in one read
+PROFILE_CONTEXT_PROJECTION = {**AUTH_CONTEXT_PROJECTION, **PROFILE_PROJECTION}
+
+# Existence checks only
+EXISTS_PROJECTION = {"_id": 1}
@@ -1,19 +1,58 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routes import auth
 from fastapi.middleware.cors import CORSMiddleware
 from app.middlewares.auth_middleware import FirebaseAuthMiddleware
+from app.middlewares.metrics_middleware import MetricsMiddleware
+from app.services.http_client import start_http_client, close_http_client
+from app.utils.silence import silence_bank
+from app.services.merge_jobs import start_job_janitor, shutdown_jobs
+from app.services.settings_cache import settings_cache
+from app.core.executors import shutdown_executors
+from app.core.logging_setup import setup_logging, shutdown_logging
+from app.db.indexes import ensure_indexes
 from app.routes import (
     auth,
     form_submition,
+    submissions,
     core_settings,
     get_user,
     voices,
     loggedin_user,
     merge_audio,
-    chatgpt  # 👈 import your new ChatGPT route
+    script_to_speech,
+    chatgpt,  # 👈 import your new ChatGPT route
+    metrics,
 )
-app = FastAPI(title="Firebase Auth API")
+
+# -------- Startup / Shutdown -----------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # JSON logs written by a background thread (LOG_LEVEL / LOG_LEVELS / LOG_DEBUG_SAMPLE_RATE)
+    setup_logging()
+    # Indexes for the hot lookups (uid, email, userId) before serving any traffic
+    await ensure_indexes()
+    # One pooled HTTP client for all outbound ElevenLabs calls
+    await start_http_client()
+    # Encode the silent frame for the default TTS output format once
+    silence_bank.warm()
+    # Periodically remove expired merge jobs and their audio
+    start_job_janitor()
+    # Admin settings snapshot, kept fresh across replicas
+    await settings_cache.load()
+    settings_cache.start_watcher()
+    try:
+        yield
+    finally:
+        await settings_cache.stop_watcher()
+        await shutdown_jobs()
+        await close_http_client()
+        shutdown_executors()
+        shutdown_logging()
+
+
+app = FastAPI(title="Firebase Auth API", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -27,6 +66,9 @@ app.add_middleware(
 # -------- The Auth Middleware -----------
 app.add_middleware(FirebaseAuthMiddleware)
 
+# -------- Latency metrics (added last → outermost, so auth time is counted) -----------
+app.add_middleware(MetricsMiddleware)
+
 
 # Routes
 app.include_router(auth.router, tags=["Authentication"])
@@ -34,7 +76,10 @@ app.include_router(auth.router, prefix="/api")
 app.include_router(get_user.router, prefix="/api")
 app.include_router(loggedin_user.router, prefix="/api")
 app.include_router(merge_audio.router, prefix="/api")
+app.include_router(script_to_speech.router, prefix="/api", tags=["ChatGPT"])
 app.include_router(form_submition.router, prefix="/api", tags=["Form"])
+app.include_router(submissions.router, prefix="/api", tags=["Form"])
 app.include_router(voices.router, prefix="/api")
 app.include_router(core_settings.router, prefix="/api/admin", tags=["Settings"])
 app.include_router(chatgpt.router)
+app.include_router(metrics.router)
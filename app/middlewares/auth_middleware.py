@@ -1,45 +1,74 @@
 #app/middlewares/auth_middleware.py 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+import re
+
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import time_stage
+from app.core.security import get_bearer_token, verify_id_token_cached
+from app.services.user_service import get_user_by_uid, get_user_profile
+
+logger = logging.getLogger(__name__)
+
+# Routes that do NOT require Firebase auth (prefix match)
+PUBLIC_PATHS = ["/api/register", "/api/login", "/api/chat", "/docs", "/openapi.json", "/metrics"]
+
+# Routes that render the user's profile: the auth lookup loads it too, so they need no second read
+PROFILE_PATHS = {"/api/user", "/api/user/me"}
 
-from app.core.security import get_current_user
-from app.db.db import users_collection
+# One compiled alternation instead of a startswith() per prefix on every request
+_PUBLIC_PATH_PATTERN = re.compile("|".join(re.escape(path) for path in PUBLIC_PATHS))
 
-# Routes that do NOT require Firebase auth
-PUBLIC_PATHS = ["/api/register", "/api/login", "/docs", "/openapi.json"]
 
-class FirebaseAuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path.startswith("/api/chat"):
-         # Skip Firebase Auth for ChatGPT route
-         return await call_next(request)
-        
-        print("👉 Request path:", request.url.path)
+def is_public_path(path: str) -> bool:
+    return _PUBLIC_PATH_PATTERN.match(path) is not None
 
-        # Allow CORS preflight
-        if request.method == "OPTIONS":
-            return await call_next(request)
 
-        # Skip auth for public endpoints
-        if any(request.url.path.startswith(path) for path in PUBLIC_PATHS):
-            return await call_next(request)
+class FirebaseAuthMiddleware:
+    """
+    Pure ASGI auth middleware. Unlike BaseHTTPMiddleware it never touches the
+    response, so streamed bodies (e.g. merged audio) pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        # Allow CORS preflight and public endpoints
+        path = scope["path"]
+        if scope["method"] == "OPTIONS" or is_public_path(path):
+            return await self.app(scope, receive, send)
+
+        logger.debug("Request", extra={"path": path, "method": scope["method"]})
 
         try:
             # 🔑 Decode Firebase token
-            user = get_current_user(request)
+            with time_stage("token_verify"):
+                claims = await verify_id_token_cached(get_bearer_token(Request(scope)))
 
-            # ✅ Ensure Firebase user exists in MongoDB
-            db_user = await users_collection.find_one({"uid": user["uid"]}, {"password": 0})
+            # ✅ Ensure Firebase user exists in MongoDB (AUTH_CONTEXT_PROJECTION fields, plus profile where needed)
+            with time_stage("mongo_user_lookup"):
+                if path in PROFILE_PATHS:
+                    db_user = await get_user_profile(claims["uid"])
+                else:
+                    db_user = await get_user_by_uid(claims["uid"])
             if not db_user:
-                return JSONResponse({"detail": "User not found"}, status_code=404)
-
-            # Attach user to request
-            request.state.user = db_user
+                response = JSONResponse({"detail": "User not found"}, status_code=404)
+                return await response(scope, receive, send)
 
         except Exception as e:
-            print("🔥 Middleware auth error:", repr(e))
-            return JSONResponse({"detail": "Invalid or expired Firebase token"}, status_code=401)
+            logger.info("Auth rejected", extra={"path": path, "error": repr(e)})
+            response = JSONResponse({"detail": "Invalid or expired Firebase token"}, status_code=401)
+            return await response(scope, receive, send)
 
-        return await call_next(request)
+        # Attach claims + user to request state (read by get_auth_context)
+        state = scope.setdefault("state", {})
+        state["claims"] = claims
+        state["user"] = db_user
 
+        await self.app(scope, receive, send)
@@ -0,0 +1,55 @@
+#app/middlewares/metrics_middleware.py
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration, http_requests_in_flight, stage_duration
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI timing middleware (outermost, so auth time is included).
+    Labels use the matched route template, never the raw path, to keep cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        response_started = None
+        status = 500
+        request_id = None
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started, status, request_id
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"request-id":
+                        # ElevenLabs request-ids of a merged render → exemplar on the latency histogram
+                        request_id = value.decode("latin-1").split(",")[0]
+                        break
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            finished = time.perf_counter()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_duration.observe(
+                finished - started,
+                exemplar={"request_id": request_id} if request_id else None,
+                method=scope["method"],
+                route=route,
+                status=status,
+            )
+            if response_started is not None:
+                # Writing the response body: serialization and (for streams) generation
+                stage_duration.observe(finished - response_started, stage="response")
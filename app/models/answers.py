@@ -1,6 +1,7 @@
 # # app/models/answers.py
 from pydantic import BaseModel, Field
-from typing import List, Any
+from typing import List, Any, Optional
+from datetime import datetime
 from bson import ObjectId
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import core_schema
@@ -39,6 +40,24 @@ class StepAnswer(BaseModel):
 # ---------------------------
 class SubmissionCreate(BaseModel):
     answers: List[StepAnswer]
+    idempotencyKey: Optional[str] = None  # client-generated; a retried submission with the same key is not stored twice
+
+
+class SubmissionBatchCreate(BaseModel):
+    # Raw items so one malformed submission doesn't reject the whole batch
+    submissions: List[Any]
+
+# ---------------------------
+# Draft Models (saved one step at a time, then finalized)
+# ---------------------------
+class DraftCreate(BaseModel):
+    answers: List[StepAnswer] = []
+
+
+class StepAnswerUpdate(BaseModel):
+    stepTitle: str
+    question: str
+    answer: Any
 
 # ---------------------------
 # Response Model
@@ -46,10 +65,39 @@ class SubmissionCreate(BaseModel):
 class SubmissionResponse(BaseModel):
     id: str = Field(..., alias="_id")
     userId: str
-    answers: List[StepAnswer]
+    answers: Optional[List[StepAnswer]] = None  # omitted in list views
+    status: Optional[str] = None  # draft | submitted (older documents have none → submitted)
+    createdAt: Optional[datetime] = None
+    submittedAt: Optional[datetime] = None
 
 
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
+
+
+# ---------------------------
+# Paginated List Model
+# ---------------------------
+class SubmissionPage(BaseModel):
+    items: List[SubmissionResponse]
+    nextCursor: Optional[str] = None  # pass back as ?cursor= for the next (older) page
+
+
+# ---------------------------
+# Batch Result Models
+# ---------------------------
+class SubmissionBatchItemResult(BaseModel):
+    index: int
+    status: str  # created | duplicate | invalid | failed
+    id: Optional[str] = None
+    idempotencyKey: Optional[str] = None
+    error: Optional[Any] = None
+
+
+class SubmissionBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: List[SubmissionBatchItemResult]
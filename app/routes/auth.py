@@ -1,12 +1,24 @@
 # app/routes/auth.py
-from fastapi import APIRouter, HTTPException, status, Request
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import JSONResponse
 from firebase_admin import auth as admin_auth
 from datetime import datetime, date
-import bcrypt
 from app.models.users import User
 from app.db.db import users_collection
+from app.db.projections import EXISTS_PROJECTION, LOGIN_PROJECTION
 from app.services import firebase_service
+from app.core.security import (
+    AuthContext,
+    get_auth_context,
+    get_bearer_token,
+    revoke_token,
+    revoke_user_tokens,
+    verify_id_token_cached,
+)
+from app.core.executors import hash_password, run_blocking
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -37,7 +49,7 @@ async def register_user(user: User, request: Request):
         # -----------------------------
         # Check MongoDB for existing user
         # -----------------------------
-        if await users_collection.find_one({"email": user.email}):
+        if await users_collection.find_one({"email": user.email}, EXISTS_PROJECTION):
             raise HTTPException(status_code=400, detail="User already exists. Please log in.")
 
         # -----------------------------
@@ -48,10 +60,11 @@ async def register_user(user: User, request: Request):
 
         if is_google_user:
             try:
-                fb_user = admin_auth.get_user_by_email(user.email)
+                fb_user = await run_blocking(admin_auth.get_user_by_email, user.email)
                 uid = fb_user.uid
             except admin_auth.UserNotFoundError:
-                fb_user = admin_auth.create_user(
+                fb_user = await run_blocking(
+                    admin_auth.create_user,
                     uid=user.uid,
                     email=user.email,
                     display_name=f"{user.firstName} {user.lastName or ''}".strip(),
@@ -60,7 +73,8 @@ async def register_user(user: User, request: Request):
                 uid = fb_user.uid
         else:
             try:
-                fb_user = admin_auth.create_user(
+                fb_user = await run_blocking(
+                    admin_auth.create_user,
                     email=user.email,
                     password=user.password,
                     display_name=f"{user.firstName} {user.lastName}".strip(),
@@ -68,13 +82,13 @@ async def register_user(user: User, request: Request):
                 uid = fb_user.uid
             except Exception as fb_err:
                 if "EMAIL_EXISTS" in str(fb_err):
-                    fb_user = admin_auth.get_user_by_email(user.email)
+                    fb_user = await run_blocking(admin_auth.get_user_by_email, user.email)
                     uid = fb_user.uid
                 else:
                     raise HTTPException(status_code=500, detail=f"Firebase error: {fb_err}")
 
-            # Hash password for MongoDB
-            hashed_pw = bcrypt.hashpw(user.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+            # Hash password for MongoDB (off the event loop; work factor from BCRYPT_ROUNDS)
+            hashed_pw = await hash_password(user.password)
 
         # -----------------------------
         # Prepare MongoDB user doc
@@ -151,10 +165,9 @@ async def login_user(request: Request):
         # Verify Firebase token
         # -----------------------------
         try:
-            decoded = admin_auth.verify_id_token(fb_token)
+            decoded = await verify_id_token_cached(fb_token)
         except Exception as e:
-            
-            print("❌ Firebase token verification failed:", repr(e))
+            logger.info("Firebase token verification failed", extra={"error": repr(e)})
             raise HTTPException(status_code=401, detail="Invalid or expired Firebase token")
 
         uid = decoded.get("uid")
@@ -168,7 +181,7 @@ async def login_user(request: Request):
         # -----------------------------
         # Ensure user exists in MongoDB
         # -----------------------------
-        mongo_user = await users_collection.find_one({"uid": uid})
+        mongo_user = await users_collection.find_one({"uid": uid}, LOGIN_PROJECTION)
 
         # If Google login and user does not exist, create Mongo record
         if not mongo_user and is_google_user:
@@ -209,7 +222,29 @@ async def login_user(request: Request):
 
     except HTTPException:
         raise
-    except Exception as err:
-        print("🔥 Login Error:", err)
+    except Exception:
+        logger.exception("Login error")
         raise HTTPException(status_code=500, detail="Server error during login")
 
+
+# ----------------------------
+# Logout
+# ----------------------------
+@router.post("/logout")
+async def logout_user(request: Request, allDevices: bool = False, ctx: AuthContext = Depends(get_auth_context)):
+    """
+    Rejects the caller's ID token from now on (on this instance). With
+    allDevices=true, also revokes the user's Firebase refresh tokens, which
+    every instance picks up through verify_id_token(check_revoked=True).
+    """
+    revoke_token(get_bearer_token(request), ctx.claims)
+
+    if allDevices:
+        revoke_user_tokens(ctx.uid)
+        try:
+            await run_blocking(admin_auth.revoke_refresh_tokens, ctx.uid)
+        except Exception as e:
+            logger.exception("Failed to revoke Firebase refresh tokens", extra={"uid": ctx.uid})
+            raise HTTPException(status_code=500, detail=f"Firebase error: {e}")
+
+    return {"success": True, "message": "Logged out"}
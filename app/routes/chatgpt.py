@@ -1,64 +1,41 @@
 # full GPT script generation (no ElevenLabs audio)
+import json
+import logging
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from dotenv import load_dotenv
-from app.db.db import core_settings_collection
-from openai import OpenAI
-import os
+from app.models.core_settings import CoreSettings
+from app.services.settings_cache import settings_cache
+from app.services.openai_service import build_prompt, generate_script, stream_script
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["ChatGPT"])
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 class ChatRequest(BaseModel):
     message: str
+    noCache: bool = False  # skip the response cache for this request
+
+
+# 🔹 Admin settings (for prompt context), from the in-process snapshot
+async def load_prompt_settings() -> CoreSettings:
+    settings = await settings_cache.get_or_load()
+    if not settings:
+        raise HTTPException(status_code=404, detail="Admin settings not found")
+    return settings
+
 
 @router.post("/chat")
 async def chat_with_gpt(payload: ChatRequest):
     try:
-        # 🔹 Fetch admin settings (for prompt context)
-        settings = await core_settings_collection.find_one({"_id": "singleton-settings"})
-        if not settings:
-            raise HTTPException(status_code=404, detail="Admin settings not found")
-
-        gpt_stage1 = settings.get("gptScriptStageOne", "")
-        gpt_stage2 = settings.get("gptScriptStageTwo", "")
-        demo_audio = settings.get("demoAudioScript", "")
+        settings = await load_prompt_settings()
 
         # 🔹 Construct the prompt
-        final_prompt = f"""
-You are an expert voice script writer. 
-Generate a **TTS-ready narration script** with natural pauses and clear pacing for voiceover.
-
-Use formatting cues like:
-- [Pause 1s]
-- [Pause 2s]
-- [Soft tone]
-- [Emphasis]
-Keep it natural and human-like.
-
-User Message:
-{payload.message}
-
-Admin Context:
-Stage 1: {gpt_stage1}
-Stage 2: {gpt_stage2}
-Demo Audio Script: {demo_audio}
-"""
-
-        print("🧠 Sending prompt to GPT...")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You generate natural, human-like TTS narration scripts."},
-                {"role": "user", "content": final_prompt},
-            ],
-        )
-
-        gpt_output = response.choices[0].message.content.strip()
-        print("✅ GPT Output:", gpt_output)
+        final_prompt = build_prompt(payload.message, settings)
+
+        logger.debug("Sending prompt to GPT", extra={"prompt_chars": len(final_prompt)})
+        gpt_output = await generate_script(final_prompt, use_cache=not payload.noCache)
+        logger.debug("GPT output", extra={"output": gpt_output})
 
         return {
             "success": True,
@@ -66,6 +43,35 @@ Demo Audio Script: {demo_audio}
             "message": "GPT script generated successfully."
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print("❌ Error in chat_with_gpt:", str(e))
+        logger.exception("Error in chat_with_gpt")
         raise HTTPException(status_code=500, detail=f"GPT generation failed: {str(e)}")
+
+
+# 🔹 Server-sent events: one `data: {"token": ...}` event per token, then `event: done`
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_with_gpt_stream(payload: ChatRequest):
+    settings = await load_prompt_settings()
+    final_prompt = build_prompt(payload.message, settings)
+
+    async def event_stream():
+        try:
+            async for token in stream_script(final_prompt, use_cache=not payload.noCache):
+                yield _sse({"token": token})
+            yield _sse({"success": True}, event="done")
+        except Exception as e:
+            logger.exception("Error in chat_with_gpt_stream")
+            yield _sse({"detail": f"GPT generation failed: {str(e)}"}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
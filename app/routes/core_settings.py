@@ -1,9 +1,13 @@
+import logging
 from fastapi import HTTPException, APIRouter
 from pymongo import ReturnDocument
 from app.db.db import core_settings_collection
 from app.models.core_settings import CoreSettings
+from app.services.settings_cache import settings_cache
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 @router.put("/settings")
@@ -12,7 +16,7 @@ async def update_settings(payload: CoreSettings):
         data = payload.dict(by_alias=True)
         result = await core_settings_collection.find_one_and_update(
             {"_id": "singleton-settings"},
-            {"$set": data},
+            {"$set": data, "$inc": {"version": 1}},  # version lets other replicas notice the change
             upsert=True,
             return_document=ReturnDocument.AFTER
         )
@@ -20,22 +24,28 @@ async def update_settings(payload: CoreSettings):
         if not result:
             raise HTTPException(status_code=500, detail="Failed to update settings")
 
+        # Refresh this replica's snapshot right away
+        settings_cache.set(result)
+
         if isinstance(result.get("_id"), ObjectId):
             result["_id"] = str(result["_id"])
 
         return {"message": "Settings updated successfully", "data": result}
-    except Exception as e:
-        print("Error updating settings:", e)
+    except Exception:
+        logger.exception("Error updating settings")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.get("/settings")
 async def get_settings():
     try:
-        settings = await core_settings_collection.find_one({"_id": "singleton-settings"})
+        # Served from the in-process snapshot (no database access)
+        settings = await settings_cache.get_or_load()
         if not settings:
             raise HTTPException(status_code=404, detail="Settings not found")
-        return {"success": True, "data": settings}
-    except Exception as e:
-        print("Error fetching settings:", e)
+        return {"success": True, "data": {**settings.dict(by_alias=True), "version": settings_cache.version}}
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching settings")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,20 +1,52 @@
 # app/routes/form_submission.py
 from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
-from app.models.answers import SubmissionCreate, SubmissionResponse
+from typing import Any, Dict, List
+from app.models.answers import (
+    SubmissionBatchCreate,
+    SubmissionBatchItemResult,
+    SubmissionBatchResponse,
+    SubmissionCreate,
+    SubmissionResponse,
+)
 from app.db.db import answers_collection
 from bson import ObjectId
+from datetime import datetime
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import logging
+import os
 
 # ✅ Import the shared auth logic
-from app.core.security import get_current_user  
+from app.core.security import AuthContext, get_auth_context
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+SUBMIT_BATCH_MAX_ITEMS = int(os.getenv("SUBMIT_BATCH_MAX_ITEMS", "500"))
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+def build_submission_doc(uid: str, payload: SubmissionCreate, now: datetime) -> Dict[str, Any]:
+    # One model_dump per submission (covers every StepAnswer)
+    doc = payload.model_dump(exclude={"idempotencyKey"} if payload.idempotencyKey is None else None)
+    doc.update({"_id": ObjectId(), "userId": uid, "status": "submitted", "createdAt": now, "submittedAt": now})
+    return doc
+
+
+async def find_by_idempotency_keys(uid: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    cursor = answers_collection.find({"userId": uid, "idempotencyKey": {"$in": keys}})
+    return {doc["idempotencyKey"]: doc async for doc in cursor}
+
+
 @router.post("/submit-form", response_model=SubmissionResponse, status_code=201)
 async def submit_form(
     payload: SubmissionCreate,
-    user: dict = Depends(get_current_user)   # 🔑 User automatically extracted
+    ctx: AuthContext = Depends(get_auth_context)   # 🔑 User automatically extracted
 ):
     try:
         # ✅ Ensure answers exist
@@ -22,19 +54,106 @@ async def submit_form(
             raise HTTPException(status_code=400, detail="Answers are required")
 
         # ✅ Build the submission doc
-        submission_doc = {
-            "userId": user["uid"],
-            "answers": [answer.dict() for answer in payload.answers],
-        }
+        submission_doc = build_submission_doc(ctx.uid, payload, datetime.utcnow())
 
-        # ✅ Insert into Mongo
-        result = await answers_collection.insert_one(submission_doc)
-        submission_doc["_id"] = str(result.inserted_id)
+        # ✅ Insert into Mongo (a retry with a known idempotencyKey returns the stored submission)
+        try:
+            await answers_collection.insert_one(submission_doc)
+        except DuplicateKeyError:
+            existing = await find_by_idempotency_keys(ctx.uid, [payload.idempotencyKey])
+            if payload.idempotencyKey not in existing:
+                raise
+            submission_doc = existing[payload.idempotencyKey]
+        submission_doc["_id"] = str(submission_doc["_id"])
 
         return submission_doc
 
     except HTTPException:
         raise
-    except Exception as e:
-        logging.error(f"Submission error: {e}")
+    except Exception:
+        logger.exception("Submission error")
         raise HTTPException(status_code=500, detail="Server error")
+
+
+# ----------------------------
+# Batch submission (offline clients flushing queued answers)
+# ----------------------------
+@router.post("/submit-form/batch", response_model=SubmissionBatchResponse, response_model_exclude_none=True)
+async def submit_form_batch(
+    payload: SubmissionBatchCreate,
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    if not payload.submissions:
+        raise HTTPException(status_code=400, detail="Submissions are required")
+    if len(payload.submissions) > SUBMIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {SUBMIT_BATCH_MAX_ITEMS} submissions per batch")
+
+    now = datetime.utcnow()
+    results: List[SubmissionBatchItemResult] = []
+    docs: List[Dict[str, Any]] = []
+    doc_results: List[SubmissionBatchItemResult] = []  # parallel to docs
+    first_by_key: Dict[str, SubmissionBatchItemResult] = {}
+    repeats: List[SubmissionBatchItemResult] = []  # same key twice within this batch
+
+    # ✅ Validate every item in one pass; bad items are reported, not fatal
+    for index, raw in enumerate(payload.submissions):
+        try:
+            item = SubmissionCreate.model_validate(raw)
+            if not item.answers:
+                raise ValueError("Answers are required")
+        except (ValidationError, ValueError) as e:
+            error = e.errors(include_url=False, include_context=False) if isinstance(e, ValidationError) else str(e)
+            results.append(SubmissionBatchItemResult(index=index, status="invalid", error=error))
+            continue
+
+        result = SubmissionBatchItemResult(index=index, status="created", idempotencyKey=item.idempotencyKey)
+        results.append(result)
+        if item.idempotencyKey and item.idempotencyKey in first_by_key:
+            result.status = "duplicate"
+            repeats.append(result)
+            continue
+
+        doc = build_submission_doc(ctx.uid, item, now)
+        result.id = str(doc["_id"])
+        docs.append(doc)
+        doc_results.append(result)
+        if item.idempotencyKey:
+            first_by_key[item.idempotencyKey] = result
+
+    # ✅ One unordered insert_many: every valid document is attempted even if some fail
+    if docs:
+        try:
+            await answers_collection.insert_many(docs, ordered=False)
+        except BulkWriteError as bwe:
+            duplicate_keys: List[str] = []
+            for err in bwe.details.get("writeErrors", []):
+                result = doc_results[err["index"]]
+                if err.get("code") == DUPLICATE_KEY_ERROR and result.idempotencyKey:
+                    result.status = "duplicate"
+                    duplicate_keys.append(result.idempotencyKey)
+                else:
+                    result.status = "failed"
+                    result.error = err.get("errmsg", "Write failed")
+                    result.id = None
+
+            # Point retried items at the submission that is already stored
+            if duplicate_keys:
+                existing = await find_by_idempotency_keys(ctx.uid, duplicate_keys)
+                for result in doc_results:
+                    if result.status == "duplicate":
+                        stored = existing.get(result.idempotencyKey)
+                        result.id = str(stored["_id"]) if stored else None
+        except Exception:
+            logger.exception("Batch submission error")
+            raise HTTPException(status_code=500, detail="Server error")
+
+    for result in repeats:
+        first = first_by_key[result.idempotencyKey]
+        result.id = first.id
+
+    return SubmissionBatchResponse(
+        created=sum(r.status == "created" for r in results),
+        duplicates=sum(r.status == "duplicate" for r in results),
+        failed=sum(r.status in ("invalid", "failed") for r in results),
+        results=results,
+    )
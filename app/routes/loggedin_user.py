@@ -1,74 +1,23 @@
 # app/routes/user.py
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
-from firebase_admin import auth as admin_auth
-from datetime import datetime
 from app.db.db import users_collection
+from app.core.security import AuthContext, get_auth_context
+from app.services.user_service import google_profile_sync_due, invalidate_user, refresh_google_profile
 
 router = APIRouter()
 
-# ----------------------------
-# Helper: Verify Firebase token
-# ----------------------------
-async def verify_token(request: Request):
-    auth_header = request.headers.get("authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing Firebase ID token")
-
-    fb_token = auth_header.split(" ")[1]
-
-    try:
-        decoded = admin_auth.verify_id_token(fb_token)
-        return decoded
-    except Exception as e:
-        print("❌ Token verification failed:", e)
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-
 # ----------------------------
 # Get current user profile
 # ----------------------------
 @router.get("/user")
-async def get_user(decoded: dict = Depends(verify_token)):
-    uid = decoded.get("uid")
-    user = await users_collection.find_one({"uid": uid})
+async def get_user(background_tasks: BackgroundTasks, ctx: AuthContext = Depends(get_auth_context)):
+    uid = ctx.uid
+    user = ctx.user  # loaded by the auth middleware with the profile fields (PROFILE_PATHS)
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # 🔄 If Google user → refresh data from Firebase
-    if user.get("isGoogleUser"):
-        try:
-            fb_user = admin_auth.get_user(uid)
-            first_name = fb_user.display_name.split(" ")[0] if fb_user.display_name else ""
-            last_name = (
-                fb_user.display_name.split(" ")[1]
-                if fb_user.display_name and len(fb_user.display_name.split(" ")) > 1
-                else ""
-            )
-
-            # Update MongoDB record with latest Firebase values
-            await users_collection.update_one(
-                {"uid": uid},
-                {
-                    "$set": {
-                        "firstName": first_name,
-                        "lastName": last_name,
-                        "photoURL": fb_user.photo_url,
-                    }
-                },
-            )
-
-            # refresh local doc
-            user.update(
-                {
-                    "firstName": first_name,
-                    "lastName": last_name,
-                    "photoURL": fb_user.photo_url,
-                }
-            )
-        except Exception as e:
-            print("⚠️ Failed to refresh Google user from Firebase:", e)
+    # 🔄 If Google user → refresh data from Firebase after the response (at most once per interval)
+    if user.get("isGoogleUser") and google_profile_sync_due(user):
+        background_tasks.add_task(refresh_google_profile, uid, user)
 
     return {
         "name": user.get("firstName", ""),
@@ -86,13 +35,10 @@ async def get_user(decoded: dict = Depends(verify_token)):
 # Update user profile (only non-Google)
 # ----------------------------
 @router.put("/user/me")
-async def update_user(request: Request, decoded: dict = Depends(verify_token)):
-    uid = decoded.get("uid")
+async def update_user(request: Request, ctx: AuthContext = Depends(get_auth_context)):
+    uid = ctx.uid
     body = await request.json()
-
-    user = await users_collection.find_one({"uid": uid})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = ctx.user  # loaded by the auth middleware with the profile fields (PROFILE_PATHS)
 
     # ❌ Block manual update for Google users
     if user.get("isGoogleUser"):
@@ -111,6 +57,7 @@ async def update_user(request: Request, decoded: dict = Depends(verify_token)):
     }
 
     await users_collection.update_one({"uid": uid}, {"$set": update_doc})
+    invalidate_user(uid)
 
     return JSONResponse(
         status_code=200,
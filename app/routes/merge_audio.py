@@ -1,15 +1,19 @@
 # NEW Code
-import os
+import logging
 import re
-import time
-import subprocess
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from fastapi import APIRouter, Request, HTTPException, Response
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Request, HTTPException, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.utils.generate_audio import generate_audio  # your ElevenLabs generator
+from app.core.security import AuthContext, get_auth_context
+from app.services.settings_cache import settings_cache
+from app.services import merge_jobs
+from app.services.tts_service import primed_audio_response, render_merged_audio, stream_merged_audio
+from app.utils.script_parser import PauseTooLongError, parse_text_with_pauses
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -19,52 +23,46 @@ audios_dir.mkdir(exist_ok=True)
 
 
 # -----------------------------
-# 🔹 Helper: Parse text into chunks (sentences + pauses)
+# 🔹 Helper: Sanitize first sentence for filename
 # -----------------------------
-def parse_text_with_pauses(text: str) -> List[Dict[str, Any]]:
-    tokens = re.split(r'(\(\d+s-pause\))', text)
-    chunks: List[Dict[str, Any]] = []
-
-    for token in tokens:
-        token = token.strip()
-        if not token:
-            continue
-        pause_match = re.match(r"\((\d+)s-pause\)", token, re.IGNORECASE)
-        if pause_match:
-            chunks.append({"type": "pause", "duration": int(pause_match.group(1))})
-        else:
-            chunks.append({"type": "text", "sentence": token})
-    return chunks
+def sanitize_filename(text: str) -> str:
+    safe_text = re.sub(r'[^a-zA-Z0-9]+', '_', text.strip().lower())
+    return safe_text[:50]  # limit length to avoid very long filenames
 
 
 # -----------------------------
-# 🔹 Helper: Generate silence file if not exists
+# 🔹 Helper: Validate request body → (voiceId, chunks)
 # -----------------------------
-def get_silence_file(duration: int) -> str:
-    silence_path = audios_dir / f"silence_{duration}s.mp3"
-    if not silence_path.exists():
-        print(f"🎵 Generating silence {duration}s")
-        subprocess.run(
-            [
-                "ffmpeg", "-y",
-                "-f", "lavfi",
-                "-i", "anullsrc=r=44100:cl=mono",
-                "-t", str(duration),
-                "-q:a", "9",
-                "-acodec", "libmp3lame",
-                str(silence_path)
-            ],
-            check=True
-        )
-    return str(silence_path)
+def parse_merge_request(body: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+    sentences: List[str] = body.get("sentences")
+    voice_id: Optional[str] = body.get("voiceId")
+
+    if not voice_id or not isinstance(sentences, list) or not sentences:
+        raise HTTPException(status_code=400, detail="voiceId and sentences are required")
+
+    # Parse all sentences into text + pauses
+    all_chunks: List[Dict[str, Any]] = []
+    try:
+        for line in sentences:
+            all_chunks.extend(parse_text_with_pauses(line))
+    except PauseTooLongError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not all_chunks:
+        raise HTTPException(status_code=400, detail="No valid sentences or pauses found")
+    return voice_id, all_chunks
 
 
 # -----------------------------
-# 🔹 Helper: Sanitize first sentence for filename
+# 🔹 Helper: Active ElevenLabs settings (part of the segment cache key)
 # -----------------------------
-def sanitize_filename(text: str) -> str:
-    safe_text = re.sub(r'[^a-zA-Z0-9]+', '_', text.strip().lower())
-    return safe_text[:50]  # limit length to avoid very long filenames
+async def load_tts_settings() -> Dict[str, Any]:
+    settings = await settings_cache.get_or_load()
+    return settings.elevenLabsSettings.dict() if settings else {}
+
+
+def suggested_filename(chunks: List[Dict[str, Any]]) -> str:
+    first_sentence_text = next((c["sentence"] for c in chunks if c["type"] == "text"), "audio")
+    return f"{sanitize_filename(first_sentence_text) or 'audio'}.mp3"
 
 
 # -----------------------------
@@ -74,87 +72,33 @@ def sanitize_filename(text: str) -> str:
 async def merge_dynamic_audio(request: Request):
     try:
         body = await request.json()
-        print("📥 Incoming request body:", body)
+        logger.debug("Merge request", extra={"payload": body})
 
-        sentences: List[str] = body.get("sentences")
-        voice_id: Optional[str] = body.get("voiceId")
+        voice_id, all_chunks = parse_merge_request(body)
+        logger.debug("Parsed chunks", extra={"chunks": len(all_chunks)})
 
-        if not voice_id or not isinstance(sentences, list) or not sentences:
-            raise HTTPException(status_code=400, detail="voiceId and sentences are required")
-
-        # Parse all sentences into text + pauses
-        all_chunks: List[Dict[str, Any]] = []
-        for line in sentences:
-            all_chunks.extend(parse_text_with_pauses(line))
-        if not all_chunks:
-            raise HTTPException(status_code=400, detail="No valid sentences or pauses found")
-
-        print("✅ Parsed chunks:", all_chunks)
-
-        # Cache silence files by duration
-        silence_cache: Dict[int, str] = {}
-
-        # Build list of audio files in exact order
-        final_files: List[str] = []
-        request_ids: List[str] = []
-
-        for chunk in all_chunks:
-            if chunk["type"] == "text":
-                # Generate TTS per sentence
-                tts_path = audios_dir / f"tts_{int(time.time()*1000)}.mp3"
-                print(f"🎤 Generating TTS for: {chunk['sentence']}")
-                res = await generate_audio(chunk["sentence"], str(tts_path), voice_id)
-                request_id = res.get("request_id")
-                if request_id:
-                    request_ids.append(request_id)
-                if not tts_path.exists():
-                    raise HTTPException(status_code=500, detail="TTS generation failed")
-                final_files.append(str(tts_path))
-            elif chunk["type"] == "pause":
-                duration = chunk["duration"]
-                if duration not in silence_cache:
-                    silence_cache[duration] = get_silence_file(duration)
-                final_files.append(silence_cache[duration])
+        tts_settings = await load_tts_settings()
 
         # -----------------------------
-        # 🔹 Generate final filename starting with first sentence
+        # 🔹 Streaming mode: send each segment as soon as it and all before it are ready
         # -----------------------------
-        first_sentence_text = all_chunks[0]['sentence'] if all_chunks else "audio"
-        safe_name = sanitize_filename(first_sentence_text)
-        output_path = audios_dir / f"{safe_name}_{int(time.time()*1000)}.mp3"
+        stream_mode = body.get("stream") is True or request.query_params.get("stream") in ("1", "true")
+        if stream_mode:
+            audio_stream = stream_merged_audio(all_chunks, voice_id, audios_dir, tts_settings)
+            # ElevenLabs request-ids aren't known up front, so no request-id header here
+            response = await primed_audio_response(audio_stream)
+            return response or Response(content=b"", media_type="audio/mpeg")
 
-        # -----------------------------
-        # 🔹 Merge all audio files into one
-        # -----------------------------
-        concat_file_path = audios_dir / f"concat_{int(time.time()*1000)}.txt"
-        with open(concat_file_path, "w", encoding="utf-8") as f:
-            for file in final_files:
-                f.write(f"file '{Path(file).as_posix()}'\n")
-
-        subprocess.run(
-            [
-                "ffmpeg", "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", str(concat_file_path),
-                "-c", "copy",
-                str(output_path)
-            ],
-            check=True
-        )
-
-        print("✅ Final audio created:", output_path)
-
-        # Cleanup intermediate TTS files and concat list
-        for f in final_files:
-            if "tts_" in f and Path(f).exists():
-                os.remove(f)
-        if concat_file_path.exists():
-            os.remove(concat_file_path)
+        # Synthesize all sentences concurrently and join them at the frame level
+        logger.debug("Generating TTS", extra={"sentences": sum(c["type"] == "text" for c in all_chunks)})
+        audio_buffer, request_ids = await render_merged_audio(all_chunks, voice_id, audios_dir, tts_settings)
+
+        # Suggested filename starting with first sentence
+        filename = suggested_filename(all_chunks)
+        logger.info("Merged audio created", extra={"audio_file": filename, "bytes": len(audio_buffer), "request_ids": request_ids})
 
         # Return merged audio
-        audio_buffer = output_path.read_bytes()
-        headers = {}
+        headers = {"Content-Disposition": f'inline; filename="{filename}"'}
         if request_ids:
             headers["request-id"] = ",".join(request_ids)
             headers["Access-Control-Expose-Headers"] = "request-id"
@@ -164,5 +108,74 @@ async def merge_dynamic_audio(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        print("🔥 Unexpected error:", str(e))
+        logger.exception("Merge audio failed")
         return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+# -----------------------------
+# 🔹 API: Background merge jobs (for long scripts)
+# -----------------------------
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    job_id = str(job["_id"])
+    status = {
+        "jobId": job_id,
+        "status": job["status"],
+        "total": job.get("total", 0),
+        "completed": job.get("completed", 0),
+        "progress": (job.get("completed", 0) / job["total"]) if job.get("total") else 1.0,
+        "chunks": job.get("chunks", []),
+        "error": job.get("error"),
+        "createdAt": job.get("createdAt"),
+        "updatedAt": job.get("updatedAt"),
+    }
+    if job["status"] == "done":
+        status["audioUrl"] = f"/api/merge-audio/jobs/{job_id}/audio"
+        status["requestIds"] = job.get("requestIds", [])
+    return status
+
+
+@router.post("/merge-audio/jobs", status_code=202)
+async def create_merge_job(request: Request, ctx: AuthContext = Depends(get_auth_context)):
+    body = await request.json()
+    voice_id, all_chunks = parse_merge_request(body)
+    tts_settings = await load_tts_settings()
+
+    job_id = await merge_jobs.create_job(
+        ctx.uid,
+        voice_id,
+        all_chunks,
+        audios_dir,
+        tts_settings,
+        filename=suggested_filename(all_chunks),
+    )
+    return {
+        "success": True,
+        "jobId": job_id,
+        "status": "queued",
+        "statusUrl": f"/api/merge-audio/jobs/{job_id}",
+    }
+
+
+@router.get("/merge-audio/jobs/{job_id}")
+async def get_merge_job(job_id: str, ctx: AuthContext = Depends(get_auth_context)):
+    job = await merge_jobs.get_job(job_id, ctx.uid)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
+
+@router.get("/merge-audio/jobs/{job_id}/audio")
+async def get_merge_job_audio(job_id: str, ctx: AuthContext = Depends(get_auth_context)):
+    job = await merge_jobs.get_job(job_id, ctx.uid)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    headers = {"Content-Disposition": f'inline; filename="{job.get("filename", "audio.mp3")}"'}
+    if job.get("size"):
+        headers["Content-Length"] = str(job["size"])
+    if job.get("requestIds"):
+        headers["request-id"] = ",".join(job["requestIds"])
+        headers["Access-Control-Expose-Headers"] = "request-id"
+    return StreamingResponse(merge_jobs.open_job_audio(job), media_type="audio/mpeg", headers=headers)
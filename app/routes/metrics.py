@@ -0,0 +1,79 @@
+# app/routes/metrics.py
+from typing import List
+
+from fastapi import APIRouter, Request, Response
+
+from app.core.executors import executor_stats
+from app.core.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    Counter,
+    Gauge,
+    registry,
+)
+from app.core.security import token_cache
+from app.services.gpt_cache import response_cache
+from app.services.tts_service import segment_cache
+from app.services.user_service import profile_cache, user_cache
+from app.services.voice_catalog import voice_catalog
+
+router = APIRouter()
+
+
+# -----------------------------
+# 🔹 Scrape-time snapshots of cache and executor stats
+# -----------------------------
+def collect_cache_stats() -> List:
+    caches = {
+        "tts_segment": segment_cache,
+        "gpt_response": response_cache,
+        "token": token_cache,
+        "user": user_cache,
+        "user_profile": profile_cache,
+        "voice_catalog": voice_catalog,
+    }
+    hits = Counter("cache_hits_total", "Cache lookups served from the cache.", ("cache",))
+    misses = Counter("cache_misses_total", "Cache lookups that went to the backing store.", ("cache",))
+    ratio = Gauge("cache_hit_ratio", "Hits / lookups since startup.", ("cache",))
+    entries = Gauge("cache_entries", "Entries currently held.", ("cache",))
+
+    for name, cache in caches.items():
+        if cache is None:  # disabled via env
+            continue
+        stats = cache.stats()
+        hits.inc(stats["hits"], cache=name)
+        misses.inc(stats["misses"], cache=name)
+        ratio.set(stats["hit_ratio"], cache=name)
+        entries.set(stats["entries"], cache=name)
+    return [hits, misses, ratio, entries]
+
+
+def collect_executor_stats() -> List:
+    in_flight = Gauge("executor_in_flight", "Calls submitted to the executor and not yet finished.", ("pool",))
+    queue_depth = Gauge("executor_queue_depth", "Calls waiting for a free worker.", ("pool",))
+    completed = Counter("executor_completed_total", "Calls finished (including failures).", ("pool",))
+    avg_wait = Gauge("executor_avg_wait_seconds", "Average time a call waited for a worker.", ("pool",))
+
+    for pool, stats in executor_stats().items():
+        in_flight.set(stats["in_flight"], pool=pool)
+        queue_depth.set(stats["queue_depth"], pool=pool)
+        completed.inc(stats["completed"], pool=pool)
+        avg_wait.set(stats["avg_wait_seconds"], pool=pool)
+    return [in_flight, queue_depth, completed, avg_wait]
+
+
+registry.add_collector(collect_cache_stats)
+registry.add_collector(collect_executor_stats)
+
+
+# -----------------------------
+# 🔹 API: Prometheus scrape endpoint
+# -----------------------------
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    # Exemplars (ElevenLabs request-ids) are only valid in OpenMetrics
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    return Response(
+        content=registry.render(openmetrics=openmetrics),
+        media_type=OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+    )
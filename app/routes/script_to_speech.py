@@ -0,0 +1,59 @@
+# app/routes/script_to_speech.py
+# GPT script → ElevenLabs audio in one streamed response
+import logging
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from app.routes.chatgpt import load_prompt_settings
+from app.routes.merge_audio import audios_dir, load_tts_settings
+from app.services.openai_service import build_prompt, stream_script
+from app.services.tts_service import primed_audio_response, stream_merged_audio
+from app.utils.script_parser import IncrementalScriptParser, PauseTooLongError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class ScriptToSpeechRequest(BaseModel):
+    message: str
+    voiceId: str
+    noCache: bool = False  # skip the GPT response cache for this request
+
+
+# -----------------------------
+# 🔹 API: Stream GPT output straight into sentence-level TTS
+# -----------------------------
+@router.post("/script-to-speech")
+async def script_to_speech(payload: ScriptToSpeechRequest):
+    """
+    Generation, synthesis and delivery overlap: each sentence goes to TTS as
+    soon as GPT finishes it, and its audio is streamed as soon as it and
+    everything before it are ready.
+    """
+    settings = await load_prompt_settings()
+    final_prompt = build_prompt(payload.message, settings)
+    tts_settings = await load_tts_settings()
+
+    async def script_chunks():
+        # Delivery cues like [Soft tone] are dropped so they aren't read aloud
+        parser = IncrementalScriptParser(strip_cues=True)
+        async for token in stream_script(final_prompt, use_cache=not payload.noCache):
+            for chunk in parser.feed(token):
+                yield chunk
+        for chunk in parser.close():
+            yield chunk
+
+    audio_stream = stream_merged_audio(script_chunks(), payload.voiceId, audios_dir, tts_settings)
+
+    # primed_audio_response waits for the first sentence, so early failures still get a proper error status
+    try:
+        response = await primed_audio_response(audio_stream)
+    except PauseTooLongError as e:
+        raise HTTPException(status_code=502, detail=f"GPT returned an unusable script: {e}")
+    except Exception as e:
+        logger.exception("Script-to-speech failed")
+        raise HTTPException(status_code=500, detail=f"Script-to-speech failed: {str(e)}")
+    if response is None:
+        raise HTTPException(status_code=502, detail="GPT returned an empty script")
+    return response
@@ -0,0 +1,188 @@
+# app/routes/submissions.py
+import logging
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pymongo import ReturnDocument
+
+from app.core.security import AuthContext, get_auth_context
+from app.db.db import answers_collection
+from app.models.answers import (
+    DraftCreate,
+    PyObjectId,
+    StepAnswerUpdate,
+    SubmissionPage,
+    SubmissionResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+SUBMISSIONS_PAGE_SIZE = int(os.getenv("SUBMISSIONS_PAGE_SIZE", "20"))
+SUBMISSIONS_MAX_PAGE_SIZE = int(os.getenv("SUBMISSIONS_MAX_PAGE_SIZE", "100"))
+SUBMISSIONS_EXPORT_BATCH_SIZE = int(os.getenv("SUBMISSIONS_EXPORT_BATCH_SIZE", "200"))
+
+# List views skip the answers array, which is most of each document
+LIST_PROJECTION = {"userId": 1, "status": 1, "createdAt": 1, "submittedAt": 1}
+
+SUBMISSION_STATUSES = ("submitted", "draft")
+
+
+# -----------------------------
+# 🔹 Helpers
+# -----------------------------
+def _parse_id(value: str, detail: str):
+    try:
+        return PyObjectId.validate(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def _user_query(uid: str, cursor: Optional[str], status: str = "submitted") -> Dict[str, Any]:
+    if status not in SUBMISSION_STATUSES:
+        raise HTTPException(status_code=400, detail="status must be 'submitted' or 'draft'")
+    # Documents written before drafts existed have no status and count as submitted
+    query: Dict[str, Any] = {"userId": uid, "status": "draft" if status == "draft" else {"$ne": "draft"}}
+    if cursor:
+        query["_id"] = {"$lt": _parse_id(cursor, "Invalid cursor")}
+    return query
+
+
+def _to_response(doc: Dict[str, Any]) -> SubmissionResponse:
+    doc["_id"] = str(doc["_id"])
+    return SubmissionResponse(**doc)
+
+
+# -----------------------------
+# 🔹 API: One page of the user's submissions, newest first
+# -----------------------------
+@router.get("/submissions", response_model=SubmissionPage, response_model_exclude_none=True)
+async def list_submissions(
+    ctx: AuthContext = Depends(get_auth_context),
+    cursor: Optional[str] = None,
+    limit: int = Query(SUBMISSIONS_PAGE_SIZE, ge=1, le=SUBMISSIONS_MAX_PAGE_SIZE),
+    includeAnswers: bool = False,
+    status: str = "submitted",
+):
+    query = _user_query(ctx.uid, cursor, status)
+    projection = None if includeAnswers else LIST_PROJECTION
+
+    try:
+        # One extra document tells us whether another page exists
+        docs = await answers_collection.find(query, projection).sort("_id", -1).limit(limit + 1).to_list(limit + 1)
+    except Exception:
+        logger.exception("Submission listing error")
+        raise HTTPException(status_code=500, detail="Server error")
+
+    has_more = len(docs) > limit
+    items = [_to_response(doc) for doc in docs[:limit]]
+    return SubmissionPage(items=items, nextCursor=items[-1].id if has_more else None)
+
+
+# -----------------------------
+# 🔹 API: Bulk export as NDJSON (one submission per line)
+# -----------------------------
+@router.get("/submissions/export")
+async def export_submissions(
+    ctx: AuthContext = Depends(get_auth_context),
+    cursor: Optional[str] = None,
+    includeAnswers: bool = True,
+):
+    query = _user_query(ctx.uid, cursor)
+    projection = None if includeAnswers else LIST_PROJECTION
+
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        # Documents are read in driver batches and written out one by one, never collected in a list
+        mongo_cursor = answers_collection.find(query, projection).sort("_id", -1).batch_size(SUBMISSIONS_EXPORT_BATCH_SIZE)
+        try:
+            async for doc in mongo_cursor:
+                line = _to_response(doc).model_dump_json(by_alias=True, exclude_none=True)
+                yield line.encode("utf-8") + b"\n"
+        finally:
+            await mongo_cursor.close()
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="submissions.ndjson"'},
+    )
+
+
+# -----------------------------
+# 🔹 API: Drafts — saved one step at a time, then finalized
+# -----------------------------
+async def _draft_error(draft_id, uid: str) -> HTTPException:
+    doc = await answers_collection.find_one({"_id": draft_id, "userId": uid}, {"status": 1})
+    if not doc:
+        return HTTPException(status_code=404, detail="Draft not found")
+    return HTTPException(status_code=409, detail="Submission is already finalized")
+
+
+@router.post("/submissions/drafts", response_model=SubmissionResponse, status_code=201, response_model_exclude_none=True)
+async def create_draft(payload: DraftCreate, ctx: AuthContext = Depends(get_auth_context)):
+    now = datetime.utcnow()
+    # One entry per step (last one wins), kept in step order
+    steps = {answer.stepNumber: answer.model_dump() for answer in payload.answers}
+    draft_doc = {
+        "userId": ctx.uid,
+        "status": "draft",
+        "answers": [steps[n] for n in sorted(steps)],
+        "createdAt": now,
+        "updatedAt": now,
+    }
+    result = await answers_collection.insert_one(draft_doc)
+    draft_doc["_id"] = str(result.inserted_id)
+    return draft_doc
+
+
+@router.patch("/submissions/drafts/{draft_id}/steps/{step_number}")
+async def save_draft_step(
+    draft_id: str,
+    step_number: int,
+    payload: StepAnswerUpdate,
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    oid = _parse_id(draft_id, "Invalid draft id")
+    now = datetime.utcnow()
+    step_doc = {"stepNumber": step_number, **payload.model_dump()}
+    draft_filter = {"_id": oid, "userId": ctx.uid, "status": "draft"}
+
+    replace_step = (
+        {**draft_filter, "answers.stepNumber": step_number},
+        {"$set": {"answers.$": step_doc, "updatedAt": now}},
+    )
+    append_step = (
+        {**draft_filter, "answers.stepNumber": {"$ne": step_number}},
+        {"$push": {"answers": {"$each": [step_doc], "$sort": {"stepNumber": 1}}}, "$set": {"updatedAt": now}},
+    )
+
+    # Overwrite the step in place, else append it; the final retry covers a concurrent append of the same step
+    for query, update in (replace_step, append_step, replace_step):
+        result = await answers_collection.update_one(query, update)
+        if result.matched_count:
+            return {"success": True, "id": draft_id, "stepNumber": step_number, "updatedAt": now}
+
+    raise await _draft_error(oid, ctx.uid)
+
+
+@router.post("/submissions/drafts/{draft_id}/finalize", response_model=SubmissionResponse, response_model_exclude_none=True)
+async def finalize_draft(draft_id: str, ctx: AuthContext = Depends(get_auth_context)):
+    oid = _parse_id(draft_id, "Invalid draft id")
+    now = datetime.utcnow()
+
+    doc = await answers_collection.find_one_and_update(
+        {"_id": oid, "userId": ctx.uid, "status": "draft", "answers.0": {"$exists": True}},
+        {"$set": {"status": "submitted", "submittedAt": now, "updatedAt": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc:
+        return _to_response(doc)
+
+    existing = await answers_collection.find_one({"_id": oid, "userId": ctx.uid, "status": "draft"}, {"_id": 1})
+    if existing:
+        raise HTTPException(status_code=400, detail="Answers are required")
+    raise await _draft_error(oid, ctx.uid)
@@ -1,14 +1,40 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from app.services.elevenlabs_service import get_all_voices
+import logging
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.services.settings_cache import settings_cache
+from app.services.voice_catalog import voice_catalog
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/voices")
-async def get_voices():
+async def get_voices(
+    request: Request,
+    category: Optional[str] = None,
+    label: List[str] = Query(default=[]),  # e.g. ?label=gender:female&label=calm (all must match)
+    useVoiceTags: bool = False,  # only voices carrying one of the admin's elevenLabsSettings.voiceTags
+):
     try:
-        voices = get_all_voices()
-        return JSONResponse(content={"voices": [v.dict() for v in voices]})
-    except Exception as e:
-        print("Error fetching voices:", str(e))
+        tags: List[str] = []
+        if useVoiceTags:
+            settings = await settings_cache.get_or_load()
+            tags = settings.elevenLabsSettings.voiceTags if settings else []
+
+        body, etag = await voice_catalog.render(category, label, tags)
+
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    except Exception:
+        logger.exception("Error fetching voices")
         raise HTTPException(status_code=500, detail="Failed to fetch voices")
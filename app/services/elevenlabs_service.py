@@ -1,12 +1,20 @@
 import os
-from elevenlabs import ElevenLabs
 from dotenv import load_dotenv
 
+from app.services.http_client import API_REQUEST_TIMEOUT, ELEVEN_API_BASE, get_http_client
+
 load_dotenv()
 
-client = ElevenLabs(api_key=os.getenv("ELEVEN_API_KEY"))
+ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY")
 
-def get_all_voices():
-    """Fetch all available voices from ElevenLabs"""
-    response = client.voices.get_all()
-    return response.voices if response and hasattr(response, "voices") else []
+async def get_all_voices():
+    """Fetch all available voices from ElevenLabs (as plain dicts)"""
+    client = get_http_client()
+    response = await client.get(
+        f"{ELEVEN_API_BASE}/v1/voices",
+        headers={"xi-api-key": ELEVEN_API_KEY},
+        timeout=API_REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data.get("voices", []) if isinstance(data, dict) else []
@@ -0,0 +1,95 @@
+# app/services/gpt_cache.py
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.db.db import gpt_cache_collection
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+GPT_CACHE_ENABLED = os.getenv("GPT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GPT_CACHE_TTL_SECONDS = float(os.getenv("GPT_CACHE_TTL_SECONDS", "86400"))
+GPT_CACHE_MAX_ENTRIES = int(os.getenv("GPT_CACHE_MAX_ENTRIES", "1000"))
+# Also store responses in Mongo so replicas share them
+GPT_CACHE_MONGO = os.getenv("GPT_CACHE_MONGO", "false").lower() in ("1", "true", "yes")
+
+
+class ResponseCache:
+    """
+    GPT completion cache keyed by hash(model, system prompt, final prompt,
+    settings version). In-process LRU with TTL, optionally backed by a Mongo
+    collection (documents carry `expiresAt` for a TTL index).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, use_mongo: bool):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_mongo = use_mongo
+        self.mongo_hits = 0
+        self.bypassed = 0
+
+        # Hits/misses are recorded once per lookup, after the Mongo fallback
+        self._entries = TTLCache(max_entries, ttl_seconds, clock=time.time)
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, final_prompt: str, settings_version: Any) -> str:
+        raw = json.dumps([model, system_prompt, final_prompt, settings_version], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        response = self._entries.get(key, record=False)
+        if response is not None:
+            self._entries.record(hit=True)
+            return response
+
+        if self.use_mongo:
+            try:
+                doc = await gpt_cache_collection.find_one(
+                    {"_id": key, "expiresAt": {"$gt": datetime.utcnow()}}, {"response": 1, "expiresAt": 1}
+                )
+            except Exception as e:
+                logger.warning("GPT cache lookup failed: %s", e)
+                doc = None
+            if doc:
+                remaining = (doc["expiresAt"] - datetime.utcnow()).total_seconds()
+                self._entries.put(key, doc["response"], time.time() + remaining)
+                self._entries.record(hit=True)
+                self.mongo_hits += 1
+                return doc["response"]
+
+        self._entries.record(hit=False)
+        return None
+
+    async def put(self, key: str, response: str) -> None:
+        self._entries.put(key, response)
+
+        if self.use_mongo:
+            now = datetime.utcnow()
+            try:
+                await gpt_cache_collection.replace_one(
+                    {"_id": key},
+                    {"response": response, "createdAt": now, "expiresAt": now + timedelta(seconds=self.ttl_seconds)},
+                    upsert=True,
+                )
+            except Exception as e:
+                logger.warning("GPT cache write failed: %s", e)
+
+    def record_bypass(self) -> None:
+        self.bypassed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._entries.stats(), "mongo_hits": self.mongo_hits, "bypassed": self.bypassed}
+
+
+response_cache: Optional[ResponseCache] = (
+    ResponseCache(GPT_CACHE_MAX_ENTRIES, GPT_CACHE_TTL_SECONDS, GPT_CACHE_MONGO) if GPT_CACHE_ENABLED else None
+)
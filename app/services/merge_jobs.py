@@ -0,0 +1,228 @@
+# app/services/merge_jobs.py
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from app.db.db import merge_audio_bucket, merge_jobs_collection
+from app.services.tts_service import render_merged_audio
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Jobs rendered at the same time by this replica (each one still shares the global TTS semaphore)
+MERGE_JOB_WORKERS = int(os.getenv("MERGE_JOB_WORKERS", "2"))
+# How long finished jobs and their audio are kept
+MERGE_JOB_RETENTION_HOURS = float(os.getenv("MERGE_JOB_RETENTION_HOURS", "24"))
+MERGE_JOB_CLEANUP_INTERVAL_SECONDS = float(os.getenv("MERGE_JOB_CLEANUP_INTERVAL_SECONDS", "600"))
+# Live jobs bump updatedAt this often; queued/running jobs not bumped for STALE seconds lost their replica
+MERGE_JOB_HEARTBEAT_SECONDS = float(os.getenv("MERGE_JOB_HEARTBEAT_SECONDS", "30"))
+MERGE_JOB_STALE_SECONDS = float(os.getenv("MERGE_JOB_STALE_SECONDS", "120"))
+
+ACTIVE_STATUSES = ["queued", "running"]
+
+_job_slots = asyncio.Semaphore(MERGE_JOB_WORKERS)
+_running: Set[asyncio.Task] = set()
+_janitor: Optional[asyncio.Task] = None
+
+
+def _object_id(job_id: str) -> Optional[ObjectId]:
+    return ObjectId(job_id) if ObjectId.is_valid(job_id) else None
+
+
+# -----------------------------
+# 🔹 Create a job and schedule it on this replica
+# -----------------------------
+async def create_job(
+    user_id: str,
+    voice_id: str,
+    chunks: List[Dict[str, Any]],
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+    filename: str = "audio.mp3",
+) -> str:
+    now = datetime.utcnow()
+    job = {
+        "userId": user_id,
+        "voiceId": voice_id,
+        "status": "queued",
+        "filename": filename,
+        "total": sum(1 for c in chunks if c["type"] == "text"),
+        "completed": 0,
+        "chunks": [
+            {"index": i, "type": c["type"], "status": "pending" if c["type"] == "text" else "done"}
+            for i, c in enumerate(chunks)
+        ],
+        "requestIds": [],
+        "resultFileId": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now,
+        "expiresAt": now + timedelta(hours=MERGE_JOB_RETENTION_HOURS),
+    }
+    result = await merge_jobs_collection.insert_one(job)
+    job_id = result.inserted_id
+
+    task = asyncio.create_task(_run_job(job_id, voice_id, chunks, output_dir, settings, filename))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return str(job_id)
+
+
+async def _run_job(
+    job_id: ObjectId,
+    voice_id: str,
+    chunks: List[Dict[str, Any]],
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]],
+    filename: str,
+) -> None:
+    async def on_segment(index: int, segment: Dict[str, Any]) -> None:
+        try:
+            await merge_jobs_collection.update_one(
+                {"_id": job_id},
+                {
+                    "$inc": {"completed": 1},
+                    "$set": {f"chunks.{index}.status": "done", "updatedAt": datetime.utcnow()},
+                },
+            )
+        except Exception as e:
+            # Progress is best effort; never fail the render because of it
+            logger.warning("Failed to record job progress: %s", e, extra={"job_id": str(job_id)})
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    try:
+        async with _job_slots:
+            await merge_jobs_collection.update_one(
+                {"_id": job_id}, {"$set": {"status": "running", "updatedAt": datetime.utcnow()}}
+            )
+
+            audio, request_ids = await render_merged_audio(chunks, voice_id, output_dir, settings, on_segment)
+            file_id = await merge_audio_bucket.upload_from_stream(
+                filename, audio, metadata={"jobId": job_id, "contentType": "audio/mpeg"}
+            )
+
+            await merge_jobs_collection.update_one(
+                {"_id": job_id},
+                {
+                    "$set": {
+                        "status": "done",
+                        "resultFileId": file_id,
+                        "size": len(audio),
+                        "requestIds": request_ids,
+                        "updatedAt": datetime.utcnow(),
+                    }
+                },
+            )
+    except asyncio.CancelledError:
+        await _mark_failed(job_id, "Server shut down before the job finished")
+        raise
+    except Exception as e:
+        logger.exception("Merge job failed", extra={"job_id": str(job_id)})
+        await _mark_failed(job_id, str(e))
+    finally:
+        heartbeat.cancel()
+
+
+async def _heartbeat(job_id: ObjectId) -> None:
+    """Keeps updatedAt fresh while this replica owns the job (queued or running)."""
+    while True:
+        await asyncio.sleep(MERGE_JOB_HEARTBEAT_SECONDS)
+        try:
+            await merge_jobs_collection.update_one(
+                {"_id": job_id, "status": {"$in": ACTIVE_STATUSES}},
+                {"$set": {"updatedAt": datetime.utcnow()}},
+            )
+        except Exception as e:
+            logger.warning("Failed to record job heartbeat: %s", e, extra={"job_id": str(job_id)})
+
+
+async def _mark_failed(job_id: ObjectId, error: str) -> None:
+    await merge_jobs_collection.update_one(
+        {"_id": job_id},
+        {"$set": {"status": "failed", "error": error, "updatedAt": datetime.utcnow()}},
+    )
+
+
+# -----------------------------
+# 🔹 Read side (any replica can answer)
+# -----------------------------
+async def get_job(job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    oid = _object_id(job_id)
+    if not oid:
+        return None
+    return await merge_jobs_collection.find_one({"_id": oid, "userId": user_id})
+
+
+async def open_job_audio(job: Dict[str, Any]) -> AsyncIterator[bytes]:
+    grid_out = await merge_audio_bucket.open_download_stream(job["resultFileId"])
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+
+# -----------------------------
+# 🔹 Lifecycle: cleanup of expired jobs, shutdown of running ones
+# -----------------------------
+async def purge_expired_jobs() -> int:
+    removed = 0
+    cursor = merge_jobs_collection.find(
+        {"expiresAt": {"$lt": datetime.utcnow()}}, {"resultFileId": 1}
+    )
+    async for job in cursor:
+        if job.get("resultFileId"):
+            try:
+                await merge_audio_bucket.delete(job["resultFileId"])
+            except Exception as e:
+                logger.warning("Failed to delete job audio: %s", e)
+        await merge_jobs_collection.delete_one({"_id": job["_id"]})
+        removed += 1
+    return removed
+
+
+async def fail_stale_jobs() -> int:
+    """Marks queued/running jobs whose replica stopped heartbeating (crash, kill -9) as failed."""
+    now = datetime.utcnow()
+    result = await merge_jobs_collection.update_many(
+        {"status": {"$in": ACTIVE_STATUSES}, "updatedAt": {"$lt": now - timedelta(seconds=MERGE_JOB_STALE_SECONDS)}},
+        {"$set": {"status": "failed", "error": "Server stopped before the job finished", "updatedAt": now}},
+    )
+    if result.modified_count:
+        logger.warning("Marked stale merge jobs as failed", extra={"jobs": result.modified_count})
+    return result.modified_count
+
+
+async def _janitor_loop() -> None:
+    # Runs right away on startup, so jobs orphaned by a crash are failed promptly
+    while True:
+        try:
+            await fail_stale_jobs()
+            await purge_expired_jobs()
+        except Exception as e:
+            logger.warning("Merge job cleanup failed: %s", e)
+        await asyncio.sleep(MERGE_JOB_CLEANUP_INTERVAL_SECONDS)
+
+
+def start_job_janitor() -> None:
+    global _janitor
+    if _janitor is None or _janitor.done():
+        _janitor = asyncio.create_task(_janitor_loop())
+
+
+async def shutdown_jobs() -> None:
+    global _janitor
+    tasks = list(_running)
+    if _janitor:
+        tasks.append(_janitor)
+        _janitor = None
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,120 @@
+# app/services/openai_service.py
+import os
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from app.core.metrics import outbound_errors, outbound_in_flight, time_stage
+from app.models.core_settings import CoreSettings
+from app.services.gpt_cache import response_cache
+from app.services.settings_cache import settings_cache
+
+load_dotenv()
+
+GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini")
+SYSTEM_PROMPT = "You generate natural, human-like TTS narration scripts."
+
+# Async client: completions never block the event loop
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def build_prompt(message: str, settings: CoreSettings) -> str:
+    gpt_stage1 = settings.gptScriptStageOne
+    gpt_stage2 = settings.gptScriptStageTwo
+    demo_audio = settings.demoAudioScript
+
+    return f"""
+You are an expert voice script writer. 
+Generate a **TTS-ready narration script** with natural pauses and clear pacing for voiceover.
+
+Use formatting cues like:
+- [Pause 1s]
+- [Pause 2s]
+- [Soft tone]
+- [Emphasis]
+Keep it natural and human-like.
+
+User Message:
+{message}
+
+Admin Context:
+Stage 1: {gpt_stage1}
+Stage 2: {gpt_stage2}
+Demo Audio Script: {demo_audio}
+"""
+
+
+def _messages(final_prompt: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": final_prompt},
+    ]
+
+
+def _cache_key(final_prompt: str) -> str:
+    return response_cache.make_key(GPT_MODEL, SYSTEM_PROMPT, final_prompt, settings_cache.version)
+
+
+async def generate_script(final_prompt: str, use_cache: bool = True) -> str:
+    """Full completion in one response."""
+    key = None
+    if response_cache:
+        if use_cache:
+            key = _cache_key(final_prompt)
+            cached = await response_cache.get(key)
+            if cached is not None:
+                return cached
+        else:
+            response_cache.record_bypass()
+
+    with time_stage("gpt"), outbound_in_flight.track_inprogress(service="openai"):
+        try:
+            response = await client.chat.completions.create(model=GPT_MODEL, messages=_messages(final_prompt))
+        except Exception:
+            outbound_errors.inc(service="openai")
+            raise
+    output = response.choices[0].message.content.strip()
+
+    if key:
+        await response_cache.put(key, output)
+    return output
+
+
+async def stream_script(final_prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+    """Yield completion tokens as they arrive (a cached response comes back as one piece)."""
+    key = None
+    if response_cache:
+        if use_cache:
+            key = _cache_key(final_prompt)
+            cached = await response_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        else:
+            response_cache.record_bypass()
+
+    parts = []
+    # Covers the whole stream, including time the consumer spends between tokens
+    with time_stage("gpt"), outbound_in_flight.track_inprogress(service="openai"):
+        try:
+            stream = await client.chat.completions.create(
+                model=GPT_MODEL, messages=_messages(final_prompt), stream=True
+            )
+        except Exception:
+            outbound_errors.inc(service="openai")
+            raise
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        finally:
+            await stream.close()
+
+    # Only complete responses are cached
+    if key:
+        await response_cache.put(key, "".join(parts).strip())
@@ -0,0 +1,97 @@
+# app/services/settings_cache.py
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.db.db import core_settings_collection
+from app.models.core_settings import CoreSettings
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SETTINGS_ID = "singleton-settings"
+# Fallback when change streams aren't available (standalone mongod): poll the version counter
+SETTINGS_POLL_SECONDS = float(os.getenv("SETTINGS_POLL_SECONDS", "30"))
+
+
+class SettingsCache:
+    """
+    In-process snapshot of the CoreSettings singleton.
+
+    Loaded at startup, replaced directly by update_settings on this replica,
+    and kept in sync with other replicas through a Mongo change stream (or,
+    without a replica set, by polling the document's `version` counter).
+    """
+
+    def __init__(self):
+        self._settings: Optional[CoreSettings] = None
+        self.version: Optional[int] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    def get(self) -> Optional[CoreSettings]:
+        return self._settings
+
+    async def get_or_load(self) -> Optional[CoreSettings]:
+        if self._settings is None:
+            await self.load()
+        return self._settings
+
+    async def load(self) -> Optional[CoreSettings]:
+        doc = await core_settings_collection.find_one({"_id": SETTINGS_ID})
+        self.set(doc)
+        return self._settings
+
+    def set(self, doc: Optional[Dict[str, Any]]) -> None:
+        if not doc:
+            self._settings, self.version = None, None
+            return
+        try:
+            settings = CoreSettings(**doc)
+        except Exception as e:
+            # Keep serving the last good snapshot
+            logger.warning("Ignoring invalid core settings document: %s", e)
+            return
+        self._settings = settings
+        self.version = doc.get("version", 0)
+
+    # -----------------------------
+    # Cross-replica invalidation
+    # -----------------------------
+    def start_watcher(self) -> None:
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop_watcher(self) -> None:
+        if self._watcher:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    async def _watch(self) -> None:
+        try:
+            pipeline = [{"$match": {"documentKey._id": SETTINGS_ID}}]
+            async with core_settings_collection.watch(pipeline, full_document="updateLookup") as stream:
+                async for change in stream:
+                    self.set(change.get("fullDocument"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("Settings change stream unavailable, polling instead: %s", e)
+            await self._poll()
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(SETTINGS_POLL_SECONDS)
+            try:
+                doc = await core_settings_collection.find_one({"_id": SETTINGS_ID}, {"version": 1})
+                if doc is None or doc.get("version", 0) != self.version:
+                    await self.load()
+            except Exception as e:
+                logger.warning("Settings poll failed: %s", e)
+
+
+settings_cache = SettingsCache()
@@ -0,0 +1,432 @@
+# app/services/tts_service.py
+import asyncio
+import logging
+import os
+import subprocess
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
+
+from app.core.metrics import time_stage
+from app.utils.generate_audio import generate_audio
+from app.utils.mp3 import FrameHeader, Mp3FormatError, iter_frames, join_mp3, strip_metadata
+from app.utils.rate_limiter import TokenBucket
+from app.utils.silence import silence_bank
+from app.utils.tts_cache import SegmentCache
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Max ElevenLabs calls in flight across the whole process
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+# Per-voice request rate (calls/second, 0 disables) and burst size
+TTS_VOICE_RATE_PER_SECOND = float(os.getenv("TTS_VOICE_RATE_PER_SECOND", "5"))
+TTS_VOICE_BURST = int(os.getenv("TTS_VOICE_BURST", "5"))
+# voiceId comes from the client, so only the most recently used voices keep a limiter
+TTS_VOICE_LIMITERS_MAX = int(os.getenv("TTS_VOICE_LIMITERS_MAX", "1000"))
+# Sentences rendered ahead of the one currently being streamed
+TTS_STREAM_WINDOW = int(os.getenv("TTS_STREAM_WINDOW", "3"))
+
+# On-disk cache of rendered segments
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+TTS_CACHE_DIR = Path(
+    os.getenv("TTS_CACHE_DIR", Path(__file__).resolve().parent.parent / "audios" / "segment_cache")
+)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+TTS_CACHE_MAX_AGE_SECONDS = float(os.getenv("TTS_CACHE_MAX_AGE_HOURS", "168")) * 3600
+
+_tts_semaphore = asyncio.Semaphore(TTS_MAX_CONCURRENCY)
+_voice_limiters = TTLCache(max(1, TTS_VOICE_LIMITERS_MAX))
+
+segment_cache: Optional[SegmentCache] = (
+    SegmentCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MAX_AGE_SECONDS) if TTS_CACHE_ENABLED else None
+)
+# Renders currently in progress, so concurrent requests for the same segment share one API call
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Called with (chunk index, segment) as each sentence finishes rendering
+SegmentCallback = Callable[[int, Dict[str, Any]], Awaitable[None]]
+
+# A whole script, or chunks that arrive over time (e.g. parsed from a GPT stream)
+ChunkSource = Union[List[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+
+def _voice_limiter(voice_id: str) -> TokenBucket:
+    limiter = _voice_limiters.get(voice_id, record=False)
+    if limiter is None:
+        limiter = TokenBucket(TTS_VOICE_RATE_PER_SECOND, TTS_VOICE_BURST)
+        _voice_limiters.put(voice_id, limiter)
+    return limiter
+
+
+# -----------------------------
+# 🔹 Helper: Attach previous/next sentence context to text chunks
+# -----------------------------
+def attach_context(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    texts = [i for i, chunk in enumerate(chunks) if chunk["type"] == "text"]
+    result = [dict(chunk) for chunk in chunks]
+
+    for pos, idx in enumerate(texts):
+        result[idx]["previous_text"] = chunks[texts[pos - 1]]["sentence"] if pos > 0 else None
+        result[idx]["next_text"] = chunks[texts[pos + 1]]["sentence"] if pos + 1 < len(texts) else None
+    return result
+
+
+# -----------------------------
+# 🔹 Synthesize one sentence (bounded by semaphore + per-voice rate limit)
+# -----------------------------
+async def _render(
+    text: str,
+    voice_id: str,
+    tts_path: Path,
+    previous_text: Optional[str],
+    next_text: Optional[str],
+) -> Tuple[bytes, Optional[str]]:
+    # Wait for the voice's rate limit first, so a throttled voice doesn't hold global slots while it sleeps
+    await _voice_limiter(voice_id).acquire()
+    async with _tts_semaphore:
+        res = await generate_audio(text, str(tts_path), voice_id, previous_text, next_text)
+
+    if not tts_path.exists():
+        raise RuntimeError("TTS generation failed")
+    data = await asyncio.to_thread(tts_path.read_bytes)
+    return data, res.get("request_id")
+
+
+def _remove_file(path: Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _read_cached(key: str) -> Optional[bytes]:
+    path = segment_cache.get(key)
+    if path is None:
+        return None
+    try:
+        return await asyncio.to_thread(path.read_bytes)
+    except FileNotFoundError:
+        # Evicted between the lookup and the read: treat as a miss
+        return None
+
+
+async def synthesize_segment(
+    text: str,
+    voice_id: str,
+    output_dir: Path,
+    previous_text: Optional[str] = None,
+    next_text: Optional[str] = None,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Returns {"audio", "request_id", "cached"}. The audio is read into memory
+    before the segment is handed to the cache, so cache eviction can never
+    pull a file out from under a merge that is still using it.
+    """
+    tts_path = output_dir / f"tts_{uuid.uuid4().hex}.mp3"
+
+    if segment_cache is None:
+        try:
+            data, request_id = await _render(text, voice_id, tts_path, previous_text, next_text)
+        finally:
+            _remove_file(tts_path)
+        return {"audio": data, "request_id": request_id, "cached": False}
+
+    key = segment_cache.make_key(voice_id, settings, text, previous_text, next_text)
+    data = await _read_cached(key)
+    if data is not None:
+        return {"audio": data, "request_id": None, "cached": True}
+
+    # Same segment already being rendered by another request → wait for it
+    pending = _inflight.get(key)
+    if pending:
+        data = await asyncio.shield(pending)
+        if data is not None:
+            return {"audio": data, "request_id": None, "cached": True}
+        # That render failed or was cancelled: fall through and render it ourselves
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    data = None
+    try:
+        data, request_id = await _render(text, voice_id, tts_path, previous_text, next_text)
+        segment_cache.put(key, tts_path)
+    finally:
+        _inflight.pop(key, None)
+        _remove_file(tts_path)
+        if not future.done():
+            future.set_result(data)
+
+    return {"audio": data, "request_id": request_id, "cached": False}
+
+
+# -----------------------------
+# 🔹 Synthesize all text chunks concurrently, keeping original order
+# -----------------------------
+async def synthesize_chunks(
+    chunks: List[Dict[str, Any]],
+    voice_id: str,
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+    on_segment: Optional[SegmentCallback] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Returns one entry per chunk: a synthesis result for text chunks, None for pauses.
+    """
+    async def render(i: int, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        segment = await synthesize_segment(
+            chunk["sentence"],
+            voice_id,
+            output_dir,
+            chunk["previous_text"],
+            chunk["next_text"],
+            settings,
+        )
+        if on_segment:
+            await on_segment(i, segment)
+        return segment
+
+    tasks: Dict[int, asyncio.Task] = {}
+    for i, chunk in enumerate(attach_context(chunks)):
+        if chunk["type"] == "text":
+            tasks[i] = asyncio.create_task(render(i, chunk))
+
+    outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    errors = [o for o in outcomes if isinstance(o, BaseException)]
+    if errors:
+        raise errors[0]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+    for i, outcome in zip(tasks.keys(), outcomes):
+        results[i] = outcome
+    return results
+
+
+# -----------------------------
+# 🔹 Synthesize chunks with bounded lookahead, yielding them in order
+# -----------------------------
+async def _with_context(chunks: ChunkSource) -> AsyncIterator[Dict[str, Any]]:
+    if isinstance(chunks, list):
+        for chunk in attach_context(chunks):
+            yield chunk
+        return
+
+    # Streamed input: the following sentence isn't known yet
+    previous_text = None
+    async for chunk in chunks:
+        chunk = dict(chunk)
+        if chunk["type"] == "text":
+            chunk["previous_text"] = previous_text
+            chunk["next_text"] = None
+            previous_text = chunk["sentence"]
+        yield chunk
+
+
+def _discard(task: Optional[asyncio.Task]) -> None:
+    if task is not None and not task.done():
+        task.cancel()
+
+
+async def stream_chunks(
+    chunks: ChunkSource,
+    voice_id: str,
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """
+    Yields (chunk, segment) pairs in chunk order as soon as each one is ready.
+    Chunks may be a list or an async iterable that is still being produced.
+    At most TTS_STREAM_WINDOW chunks are rendered ahead of the consumer, so
+    memory and disk use stay bounded regardless of script length.
+    """
+    window: asyncio.Queue = asyncio.Queue(maxsize=max(1, TTS_STREAM_WINDOW))
+
+    async def produce():
+        try:
+            async for chunk in _with_context(chunks):
+                task = None
+                if chunk["type"] == "text":
+                    task = asyncio.create_task(
+                        synthesize_segment(
+                            chunk["sentence"],
+                            voice_id,
+                            output_dir,
+                            chunk["previous_text"],
+                            chunk["next_text"],
+                            settings,
+                        )
+                    )
+                try:
+                    await window.put((chunk, task))
+                except asyncio.CancelledError:
+                    _discard(task)
+                    raise
+        except Exception as e:
+            await window.put(e)
+            return
+        await window.put(None)
+
+    producer = asyncio.create_task(produce())
+    current: Optional[asyncio.Task] = None
+    try:
+        while True:
+            item = await window.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            chunk, current = item
+            segment = await current if current else None
+            current = None
+            yield chunk, segment
+    finally:
+        # Client went away or a segment failed: stop pending renders
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        _discard(current)
+        while not window.empty():
+            item = window.get_nowait()
+            if isinstance(item, tuple):
+                _discard(item[1])
+
+
+# -----------------------------
+# 🔹 Helpers: Segment bytes
+# -----------------------------
+def _first_header(data: bytes) -> Optional[FrameHeader]:
+    for _, header in iter_frames(data):
+        return header
+    return None
+
+
+def _audio_frames(data: bytes) -> bytes:
+    # Per-file ID3/Xing headers in the middle of a stream confuse players
+    try:
+        return strip_metadata(data)
+    except Mp3FormatError:
+        return data
+
+
+# -----------------------------
+# 🔹 Helper: ffmpeg concat (fallback when MP3 formats don't match)
+# -----------------------------
+def concat_with_ffmpeg(segments: List[bytes]) -> bytes:
+    with tempfile.TemporaryDirectory(prefix="merge_") as tmp:
+        tmp_dir = Path(tmp)
+        concat_file_path = tmp_dir / "concat.txt"
+        output_path = tmp_dir / "merged.mp3"
+
+        with open(concat_file_path, "w", encoding="utf-8") as f:
+            for i, data in enumerate(segments):
+                part = tmp_dir / f"part_{i}.mp3"
+                part.write_bytes(data)
+                f.write(f"file '{part.as_posix()}'\n")
+
+        subprocess.run(
+            [
+                "ffmpeg", "-y",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", str(concat_file_path),
+                "-c:a", "libmp3lame",
+                "-b:a", "128k",
+                str(output_path)
+            ],
+            check=True
+        )
+        return output_path.read_bytes()
+
+
+# -----------------------------
+# 🔹 Render a whole script into one MP3
+# -----------------------------
+async def render_merged_audio(
+    chunks: List[Dict[str, Any]],
+    voice_id: str,
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+    on_segment: Optional[SegmentCallback] = None,
+) -> Tuple[bytes, List[str]]:
+    """Returns (merged MP3 bytes, ElevenLabs request-ids in chunk order)."""
+    segments = await synthesize_chunks(chunks, voice_id, output_dir, settings, on_segment)
+
+    request_ids: List[str] = []
+    segment_bytes: Dict[int, bytes] = {}
+    for i, segment in enumerate(segments):
+        if segment:
+            segment_bytes[i] = segment["audio"]
+            if segment.get("request_id"):
+                request_ids.append(segment["request_id"])
+
+    # Silence matches the TTS output's sample rate / bitrate
+    template = next((h for h in map(_first_header, segment_bytes.values()) if h), None)
+
+    parts: List[bytes] = []
+    for i, chunk in enumerate(chunks):
+        if chunk["type"] == "text":
+            parts.append(segment_bytes[i])
+        elif chunk["type"] == "pause":
+            with time_stage("silence"):
+                parts.append(silence_bank.silence(chunk["duration"], template))
+
+    try:
+        with time_stage("concat"):
+            audio = await asyncio.to_thread(join_mp3, parts)
+    except Mp3FormatError as e:
+        # Inputs don't share sample rate / channels → let ffmpeg re-encode
+        logger.warning("Falling back to ffmpeg concat: %s", e)
+        with time_stage("ffmpeg_concat"):
+            audio = await asyncio.to_thread(concat_with_ffmpeg, parts)
+
+    return audio, request_ids
+
+
+# -----------------------------
+# 🔹 Stream a script as MP3 frames, segment by segment
+# -----------------------------
+async def stream_merged_audio(
+    chunks: ChunkSource,
+    voice_id: str,
+    output_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[bytes]:
+    template: Optional[FrameHeader] = None
+
+    async for chunk, segment in stream_chunks(chunks, voice_id, output_dir, settings):
+        if chunk["type"] == "text":
+            data = segment["audio"]
+            template = template or _first_header(data)
+            yield _audio_frames(data)
+        elif chunk["type"] == "pause":
+            # ~1 s pieces, so a long pause never sits in memory whole
+            for piece in silence_bank.iter_silence(chunk["duration"], template):
+                yield piece
+
+
+async def primed_audio_response(audio_stream: AsyncIterator[bytes]) -> Optional[StreamingResponse]:
+    """
+    Waits for the first piece of audio before returning a StreamingResponse, so
+    failures before any audio is ready still get a proper error status (the
+    stream's exception propagates). Returns None if the stream yields nothing.
+    """
+    try:
+        first = await audio_stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+    async def body_iterator():
+        try:
+            yield first
+            async for data in audio_stream:
+                yield data
+        finally:
+            await audio_stream.aclose()
+
+    return StreamingResponse(body_iterator(), media_type="audio/mpeg")
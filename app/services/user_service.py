@@ -0,0 +1,128 @@
+# app/services/user_service.py
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+from dotenv import load_dotenv
+from firebase_admin import auth as admin_auth
+
+from app.core.executors import run_blocking
+from app.db.db import users_collection
+from app.db.projections import AUTH_CONTEXT_PROJECTION, PROFILE_CONTEXT_PROJECTION
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Short-lived uid → user document cache (per replica; invalidated on profile writes)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Minimum time between Firebase profile refreshes for a Google user
+GOOGLE_PROFILE_SYNC_MINUTES = float(os.getenv("GOOGLE_PROFILE_SYNC_MINUTES", "15"))
+
+
+class UserCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries = TTLCache(max_entries, ttl_seconds)
+
+    def get(self, uid: str) -> Optional[Dict[str, Any]]:
+        user = self._entries.get(uid)
+        return dict(user) if user is not None else None  # callers may modify their copy
+
+    def put(self, uid: str, user: Dict[str, Any]) -> None:
+        self._entries.put(uid, dict(user))
+
+    def invalidate(self, uid: str) -> None:
+        self._entries.pop(uid)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+
+user_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+# Same, with the profile fields (PROFILE_CONTEXT_PROJECTION) for the /api/user routes
+profile_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+
+async def _cached_user(cache: UserCache, uid: str, projection: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    user = cache.get(uid)
+    if user is not None:
+        return user
+
+    user = await users_collection.find_one({"uid": uid}, projection)
+    if user:
+        cache.put(uid, user)
+    return user
+
+
+async def get_user_by_uid(uid: str) -> Optional[Dict[str, Any]]:
+    """User document (auth-context fields only), served from the short-TTL cache when possible."""
+    return await _cached_user(user_cache, uid, AUTH_CONTEXT_PROJECTION)
+
+
+async def get_user_profile(uid: str) -> Optional[Dict[str, Any]]:
+    """Auth-context fields plus the profile fields, served from the short-TTL cache when possible."""
+    return await _cached_user(profile_cache, uid, PROFILE_CONTEXT_PROJECTION)
+
+
+def invalidate_user(uid: str) -> None:
+    """Call after any write to a user's profile."""
+    user_cache.invalidate(uid)
+    profile_cache.invalidate(uid)
+
+
+# -----------------------------
+# 🔄 Google profile refresh (rate-limited per uid via lastSyncedAt)
+# -----------------------------
+_syncing: Set[str] = set()
+
+
+def google_profile_sync_due(user: Dict[str, Any]) -> bool:
+    if user.get("uid") in _syncing:
+        return False
+    last_synced = user.get("lastSyncedAt")
+    return not last_synced or datetime.utcnow() - last_synced >= timedelta(minutes=GOOGLE_PROFILE_SYNC_MINUTES)
+
+
+async def refresh_google_profile(uid: str, user: Dict[str, Any]) -> None:
+    """
+    Pull name/photo from Firebase and write them to Mongo only if they changed.
+    Meant to run as a background task after the response has been sent.
+    """
+    if uid in _syncing:
+        return
+    _syncing.add(uid)
+    try:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(minutes=GOOGLE_PROFILE_SYNC_MINUTES)
+
+        # Claim this sync window atomically so other requests/replicas skip it
+        claim = await users_collection.update_one(
+            {
+                "uid": uid,
+                "$or": [{"lastSyncedAt": {"$exists": False}}, {"lastSyncedAt": None}, {"lastSyncedAt": {"$lt": cutoff}}],
+            },
+            {"$set": {"lastSyncedAt": now}},
+        )
+        if claim.modified_count == 0:
+            return
+
+        fb_user = await run_blocking(admin_auth.get_user, uid)
+        name_parts = fb_user.display_name.split(" ") if fb_user.display_name else []
+        latest = {
+            "firstName": name_parts[0] if name_parts else "",
+            "lastName": name_parts[1] if len(name_parts) > 1 else "",
+            "photoURL": fb_user.photo_url,
+        }
+
+        changed = {field: value for field, value in latest.items() if user.get(field) != value}
+        if changed:
+            await users_collection.update_one({"uid": uid}, {"$set": changed})
+    except Exception as e:
+        logger.warning("Failed to refresh Google user from Firebase: %s", e, extra={"uid": uid})
+    finally:
+        _syncing.discard(uid)
+        invalidate_user(uid)
@@ -0,0 +1,161 @@
+# app/services/voice_catalog.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from app.services.elevenlabs_service import get_all_voices
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Fresh for TTL; between TTL and STALE the old catalog is served while it refreshes in the background
+VOICE_CATALOG_TTL_SECONDS = float(os.getenv("VOICE_CATALOG_TTL_SECONDS", "300"))
+VOICE_CATALOG_STALE_SECONDS = float(os.getenv("VOICE_CATALOG_STALE_SECONDS", "3600"))
+# Distinct filtered responses memoized per catalog snapshot
+VOICE_CATALOG_MAX_VIEWS = int(os.getenv("VOICE_CATALOG_MAX_VIEWS", "256"))
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+class VoiceCatalog:
+    """
+    ElevenLabs voice list cached in memory as pre-serialized JSON, with an
+    index by category and label so filtered views never rescan the voices.
+    """
+
+    def __init__(self):
+        self._voices: List[Dict[str, Any]] = []
+        self._encoded: List[bytes] = []  # JSON per voice, same order as _voices
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_label: Dict[str, Set[int]] = {}  # "value" and "key:value" → voice positions
+        self._views: Dict[Tuple, Tuple[bytes, str]] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.hits = 0  # served from memory (fresh or stale)
+        self.misses = 0  # had to wait for ElevenLabs
+        self.stale_served = 0
+
+    # -----------------------------
+    # Freshness
+    # -----------------------------
+    async def ensure_fresh(self) -> None:
+        age = None if self._fetched_at is None else time.monotonic() - self._fetched_at
+        if age is None:
+            self.misses += 1
+            await self.refresh()
+            return
+        if age > VOICE_CATALOG_STALE_SECONDS:
+            self.misses += 1
+            try:
+                await self.refresh()
+            except Exception as e:
+                # An old catalog beats an error; retried on the next request
+                logger.warning("Voice catalog refresh failed, serving stale catalog: %s", e)
+                self.stale_served += 1
+            return
+        self.hits += 1
+        if age > VOICE_CATALOG_TTL_SECONDS:
+            self.stale_served += 1
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Voice catalog background refresh failed: %s", e)
+
+    async def refresh(self) -> None:
+        fetched_before = self._fetched_at
+        async with self._lock:
+            if self._fetched_at != fetched_before:
+                return  # another request refreshed it while we waited
+            voices = await get_all_voices()
+            self._build(voices)
+
+    def _build(self, voices: List[Dict[str, Any]]) -> None:
+        by_category: Dict[str, Set[int]] = {}
+        by_label: Dict[str, Set[int]] = {}
+        for i, voice in enumerate(voices):
+            if voice.get("category"):
+                by_category.setdefault(_norm(voice["category"]), set()).add(i)
+            for key, value in (voice.get("labels") or {}).items():
+                if value in (None, ""):
+                    continue
+                by_label.setdefault(_norm(value), set()).add(i)
+                by_label.setdefault(f"{_norm(key)}:{_norm(value)}", set()).add(i)
+
+        self._voices = voices
+        self._encoded = [json.dumps(v, separators=(",", ":")).encode("utf-8") for v in voices]
+        self._by_category = by_category
+        self._by_label = by_label
+        self._views = {}
+        self._fetched_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._voices),
+            "views": len(self._views),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    # -----------------------------
+    # Views
+    # -----------------------------
+    def _select(self, category: Optional[str], labels: Iterable[str], any_tags: Iterable[str]) -> List[int]:
+        selected: Optional[Set[int]] = None
+
+        if category:
+            selected = set(self._by_category.get(_norm(category), ()))
+        for label in labels:  # every label must match
+            matches = self._by_label.get(_norm(label), set())
+            selected = set(matches) if selected is None else selected & matches
+
+        any_tags = [t for t in any_tags if t and t.strip()]
+        if any_tags:  # at least one tag must match
+            tagged: Set[int] = set()
+            for tag in any_tags:
+                tagged |= self._by_label.get(_norm(tag), set())
+            selected = tagged if selected is None else selected & tagged
+
+        return list(range(len(self._voices))) if selected is None else sorted(selected)
+
+    async def render(
+        self,
+        category: Optional[str] = None,
+        labels: Iterable[str] = (),
+        any_tags: Iterable[str] = (),
+    ) -> Tuple[bytes, str]:
+        """Returns ({"voices": [...]} JSON bytes, ETag) for the filtered view."""
+        await self.ensure_fresh()
+
+        view_key = (_norm(category or ""), tuple(sorted(map(_norm, labels))), tuple(sorted(map(_norm, any_tags))))
+        view = self._views.get(view_key)
+        if view is None:
+            positions = self._select(category, labels, any_tags)
+            body = b'{"voices":[' + b",".join(self._encoded[i] for i in positions) + b"]}"
+            view = (body, _etag(body))
+            if len(self._views) < VOICE_CATALOG_MAX_VIEWS:
+                self._views[view_key] = view
+        return view
+
+
+voice_catalog = VoiceCatalog()
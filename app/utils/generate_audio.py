@@ -1,9 +1,14 @@
 # utils/generate_audio.py
+import logging
 import os
-import httpx
 from pathlib import Path
 from dotenv import load_dotenv
 
+from app.core.metrics import outbound_errors, outbound_in_flight, time_stage
+from app.services.http_client import ELEVEN_API_BASE, TTS_REQUEST_TIMEOUT, get_http_client
+
+logger = logging.getLogger(__name__)
+
 load_dotenv()  # Load .env file
 
 ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY")
@@ -16,7 +21,7 @@ async def generate_audio(
     next_text: str | None = None,
 ) -> tuple[str | None, str]:
   
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    url = f"{ELEVEN_API_BASE}/v1/text-to-speech/{voice_id}"
     headers = {
         "xi-api-key": ELEVEN_API_KEY,
         "Content-Type": "application/json",
@@ -27,29 +32,42 @@ async def generate_audio(
         "next_text": next_text,
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(url, headers=headers, json=payload)
-
-        if response.status_code != 200:
-            print("❌ ElevenLabs error response:", response.text)
-            response.raise_for_status()
+    # Shared pooled client: keeps connections alive across sentences and requests
+    client = get_http_client()
+    with time_stage("tts") as exemplar, outbound_in_flight.track_inprogress(service="elevenlabs"):
+        try:
+            response = await client.post(url, headers=headers, json=payload, timeout=TTS_REQUEST_TIMEOUT)
+        except Exception:
+            outbound_errors.inc(service="elevenlabs")
+            raise
 
         request_id = response.headers.get("request-id")or response.headers.get("Request-Id")
-
         if request_id:
-            print(f"✅ request-id found: {request_id}")
-        else:
-            print("⚠️ No request-id found in response headers")
-            print("Available headers:", dict(response.headers))
-
-        # Ensure directory exists
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        # Save audio file
-        with open(output_path, "wb") as f:
-            f.write(response.content)
-
-        return {
-            "request_id": request_id,
-            "output_path": str(Path(output_path).resolve())
-        }
+            exemplar["request_id"] = request_id  # correlate slow TTS calls with ElevenLabs logs
+
+    if response.status_code != 200:
+        outbound_errors.inc(service="elevenlabs")
+        logger.error(
+            "ElevenLabs error response",
+            extra={"status": response.status_code, "body": response.text, "voice_id": voice_id},
+        )
+        response.raise_for_status()
+
+    if request_id:
+        logger.debug("ElevenLabs request-id", extra={"request_id": request_id})
+    else:
+        # Header names only; values may carry credentials
+        logger.warning("No request-id in ElevenLabs response", extra={"headers": list(response.headers.keys())})
+
+    # Ensure directory exists
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # Save audio file
+    with open(output_path, "wb") as f:
+        f.write(response.content)
+
+    return {
+        "request_id": request_id,
+        "output_path": str(Path(output_path).resolve())
+    }
+
@@ -0,0 +1,203 @@
+# utils/mp3.py
+"""
+Minimal MPEG-1/2/2.5 Layer III frame handling: enough to split files into
+frames, strip ID3/Xing metadata and join compatible streams without ffmpeg.
+"""
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Layer III bitrates (kbps) by bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+_MONO = 3  # channel mode bits
+
+
+class Mp3FormatError(ValueError):
+    """Raised when input can't be joined at the frame level."""
+
+
+class FrameHeader(NamedTuple):
+    raw: bytes
+    version_bits: int
+    has_crc: bool
+    bitrate_index: int
+    bitrate: int  # kbps
+    sample_rate: int
+    padding: int
+    channel_mode: int
+    frame_length: int
+    samples_per_frame: int
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.channel_mode == _MONO else 2
+
+    @property
+    def side_info_length(self) -> int:
+        if self.version_bits == 3:
+            return 17 if self.channel_mode == _MONO else 32
+        return 9 if self.channel_mode == _MONO else 17
+
+    @property
+    def stream_format(self) -> Tuple[int, int, int]:
+        """Parameters that must match for frames to be concatenated."""
+        return (self.version_bits, self.sample_rate, self.channels)
+
+
+def _frame_length(version_bits: int, bitrate: int, sample_rate: int, padding: int) -> int:
+    coefficient = 144000 if version_bits == 3 else 72000
+    return coefficient * bitrate // sample_rate + padding
+
+
+def parse_header(data: Buffer, offset: int = 0) -> Optional[FrameHeader]:
+    """Parse a Layer III frame header at `offset`, or return None if there isn't one."""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset], data[offset + 1], data[offset + 2], data[offset + 3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None  # reserved values, free format or not Layer III
+
+    bitrate = (_BITRATES_V1 if version_bits == 3 else _BITRATES_V2)[bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    return FrameHeader(
+        raw=bytes((b0, b1, b2, b3)),
+        version_bits=version_bits,
+        has_crc=not (b1 & 0x01),
+        bitrate_index=bitrate_index,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        channel_mode=b3 >> 6,
+        frame_length=_frame_length(version_bits, bitrate, sample_rate, padding),
+        samples_per_frame=1152 if version_bits == 3 else 576,
+    )
+
+
+def build_header(sample_rate: int, bitrate: int, channels: int) -> FrameHeader:
+    """Layer III header (no CRC, no padding) for the given output format."""
+    version_bits = next((v for v, rates in _SAMPLE_RATES.items() if sample_rate in rates), None)
+    bitrates = _BITRATES_V1 if version_bits == 3 else _BITRATES_V2
+    if version_bits is None or bitrate not in bitrates[1:]:
+        raise Mp3FormatError(f"Unsupported MP3 format: {sample_rate} Hz, {bitrate} kbps")
+
+    raw = bytes((
+        0xFF,
+        0xE0 | (version_bits << 3) | (1 << 1) | 0x01,
+        (bitrates.index(bitrate) << 4) | (_SAMPLE_RATES[version_bits].index(sample_rate) << 2),
+        (_MONO if channels == 1 else 0) << 6,
+    ))
+    return parse_header(raw)
+
+
+def _id3v2_length(data: Buffer) -> int:
+    if len(data) < 10 or bytes(data[:3]) != b"ID3":
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)  # synchsafe integer
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_vbr_info_frame(frame: Buffer, header: FrameHeader) -> bool:
+    offset = 4 + (2 if header.has_crc else 0) + header.side_info_length
+    if bytes(frame[offset:offset + 4]) in (b"Xing", b"Info"):
+        return True
+    return bytes(frame[36:40]) == b"VBRI"
+
+
+def iter_frames(data: Buffer) -> Iterator[Tuple[memoryview, FrameHeader]]:
+    """Yield (frame bytes, header) for every audio frame, skipping tags and VBR info frames."""
+    view = memoryview(data)
+    end = len(view)
+    if end >= 128 and bytes(view[end - 128:end - 125]) == b"TAG":
+        end -= 128  # ID3v1 trailer
+
+    offset = _id3v2_length(view)
+    first = True
+    while offset + 4 <= end:
+        header = parse_header(view, offset)
+        if header is None or offset + header.frame_length > end:
+            offset += 1  # resync
+            continue
+
+        # After garbage, only trust a sync word that's followed by another frame (or EOF)
+        next_offset = offset + header.frame_length
+        if next_offset + 4 <= end and parse_header(view, next_offset) is None:
+            offset += 1
+            continue
+
+        frame = view[offset:next_offset]
+        if not (first and _is_vbr_info_frame(frame, header)):
+            yield frame, header
+        first = False
+        offset = next_offset
+
+
+def strip_metadata(data: Buffer) -> bytes:
+    """Return only the audio frames of an MP3 (no ID3 tags, no Xing/Info header)."""
+    frames = [frame for frame, _ in iter_frames(data)]
+    if not frames:
+        raise Mp3FormatError("No MPEG Layer III frames found")
+    return b"".join(frames)
+
+
+def _build_info_frame(template: FrameHeader, frame_count: int, audio_bytes: int, cbr: bool) -> bytes:
+    # Same stream parameters as the audio, no CRC and no padding
+    b0, b1, b2, b3 = template.raw
+    raw = bytes((b0, b1 | 0x01, b2 & ~0x02 & 0xFF, b3))
+    header = parse_header(raw + b"\x00" * 4)
+    length = header.frame_length
+
+    frame = bytearray(length)
+    frame[:4] = raw
+    offset = 4 + header.side_info_length
+    frame[offset:offset + 4] = b"Info" if cbr else b"Xing"
+    # Flags: frame count + byte count present
+    struct.pack_into(">III", frame, offset + 4, 0x03, frame_count, audio_bytes + length)
+    return bytes(frame)
+
+
+def join_mp3(segments: Sequence[Buffer]) -> bytes:
+    """
+    Concatenate MP3 files at the frame level and prepend a single Xing/Info
+    header describing the result. Raises Mp3FormatError if the inputs don't
+    share sample rate, MPEG version and channel count.
+    """
+    frames: List[memoryview] = []
+    headers: List[FrameHeader] = []
+    for data in segments:
+        for frame, header in iter_frames(data):
+            frames.append(frame)
+            headers.append(header)
+
+    if not frames:
+        raise Mp3FormatError("No MPEG Layer III frames found")
+
+    formats = {h.stream_format for h in headers}
+    if len(formats) > 1:
+        raise Mp3FormatError(f"Mismatched MP3 stream formats: {sorted(formats)}")
+
+    cbr = len({h.bitrate_index for h in headers}) == 1
+    audio_bytes = sum(len(f) for f in frames)
+    info = _build_info_frame(headers[0], len(frames), audio_bytes, cbr)
+    return b"".join([info, *frames])
@@ -0,0 +1,111 @@
+# utils/script_parser.py
+import os
+import re
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Longest pause a script may ask for; silence is built in memory, so this bounds it
+MAX_PAUSE_SECONDS = float(os.getenv("TTS_MAX_PAUSE_SECONDS", "60"))
+
+# Pause cues: "(2s-pause)", "(0.5s-pause)" and the GPT prompt's "[Pause 1s]"
+PAUSE_PATTERN = re.compile(
+    r"\((\d+(?:\.\d+)?)s-pause\)|\[pause\s+(\d+(?:\.\d+)?)\s*s\]", re.IGNORECASE
+)
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) followed by whitespace, or a line break
+SENTENCE_END_PATTERN = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n+")
+
+# Non-pause delivery cues ("[Soft tone]", "[Emphasis]") and markdown emphasis, which TTS would read aloud
+_CUE_PATTERN = re.compile(r"\[[^\]]*\]|\*+|^#+\s*", re.MULTILINE)
+
+
+class PauseTooLongError(ValueError):
+    pass
+
+
+# -----------------------------
+# 🔹 Parse text into chunks (sentences + pauses)
+# -----------------------------
+def parse_text_with_pauses(text: str) -> List[Dict[str, Any]]:
+    chunks: List[Dict[str, Any]] = []
+    position = 0
+
+    for match in PAUSE_PATTERN.finditer(text):
+        sentence = text[position:match.start()].strip()
+        if sentence:
+            chunks.append({"type": "text", "sentence": sentence})
+        duration = float(match.group(1) or match.group(2))
+        if duration > MAX_PAUSE_SECONDS:
+            raise PauseTooLongError(
+                f"Pause of {duration:g}s is longer than the {MAX_PAUSE_SECONDS:g}s limit: {match.group(0)}"
+            )
+        chunks.append({"type": "pause", "duration": duration})
+        position = match.end()
+
+    sentence = text[position:].strip()
+    if sentence:
+        chunks.append({"type": "text", "sentence": sentence})
+    return chunks
+
+
+def strip_delivery_cues(text: str) -> str:
+    return re.sub(r"\s{2,}", " ", _CUE_PATTERN.sub("", text)).strip()
+
+
+# -----------------------------
+# 🔹 Incremental parser for streamed text (e.g. GPT tokens)
+# -----------------------------
+class IncrementalScriptParser:
+    """
+    Feed text as it arrives; complete sentences and pause cues come out as
+    soon as they are closed. Uses the same grammar as parse_text_with_pauses,
+    and never splits a pause cue that is still being typed.
+    """
+
+    def __init__(self, strip_cues: bool = False):
+        self.strip_cues = strip_cues
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        self._buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        chunks: List[Dict[str, Any]] = []
+        while True:
+            pause = PAUSE_PATTERN.search(self._buffer)
+            end = SENTENCE_END_PATTERN.search(self._buffer)
+            if pause and (not end or pause.start() < end.end()):
+                cut = pause.end()
+            elif end:
+                cut = end.end()
+            else:
+                break
+            chunks.extend(self._parse(self._buffer[:cut]))
+            self._buffer = self._buffer[cut:]
+
+        if final:
+            chunks.extend(self._parse(self._buffer))
+            self._buffer = ""
+        return chunks
+
+    def _parse(self, text: str) -> List[Dict[str, Any]]:
+        chunks = parse_text_with_pauses(text)
+        if not self.strip_cues:
+            return chunks
+
+        cleaned = []
+        for chunk in chunks:
+            if chunk["type"] == "text":
+                sentence = strip_delivery_cues(chunk["sentence"])
+                if not sentence:
+                    continue
+                chunk = {"type": "text", "sentence": sentence}
+            cleaned.append(chunk)
+        return cleaned
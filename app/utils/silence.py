@@ -0,0 +1,60 @@
+# utils/silence.py
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.utils.mp3 import FrameHeader, build_header, parse_header
+
+load_dotenv()
+
+# ElevenLabs default output format is mp3_44100_128 (mono)
+TTS_OUTPUT_SAMPLE_RATE = int(os.getenv("TTS_OUTPUT_SAMPLE_RATE", "44100"))
+TTS_OUTPUT_BITRATE = int(os.getenv("TTS_OUTPUT_BITRATE", "128"))
+TTS_OUTPUT_CHANNELS = int(os.getenv("TTS_OUTPUT_CHANNELS", "1"))
+
+
+class SilenceBank:
+    """
+    Silent MP3 audio built from a single encoded frame. A Layer III frame
+    whose side info and main data are all zero decodes to digital silence,
+    so any duration is just that frame repeated, with no encoder involved.
+    """
+
+    def __init__(self, default_header: FrameHeader):
+        self.default_header = default_header
+        self._frames: Dict[Tuple[int, int, int, int], bytes] = {}
+
+    def warm(self) -> None:
+        self.frame_for(self.default_header)
+
+    def frame_for(self, template: FrameHeader) -> bytes:
+        key = (*template.stream_format, template.bitrate_index)
+        frame = self._frames.get(key)
+        if frame is None:
+            b0, b1, b2, b3 = template.raw
+            raw = bytes((b0, b1 | 0x01, b2 & ~0x02 & 0xFF, b3))  # no CRC, no padding
+            header = parse_header(raw)
+            frame = raw + bytes(header.frame_length - 4)
+            self._frames[key] = frame
+        return frame
+
+    def silence(self, duration: float, template: Optional[FrameHeader] = None) -> bytes:
+        """Silent audio of `duration` seconds (sub-second values allowed), matching `template`."""
+        return b"".join(self.iter_silence(duration, template))
+
+    def iter_silence(
+        self, duration: float, template: Optional[FrameHeader] = None, chunk_seconds: float = 1.0
+    ) -> Iterator[bytes]:
+        """Same audio as silence(), in pieces of about `chunk_seconds` each."""
+        template = template or self.default_header
+        frame = self.frame_for(template)
+        frames_per_second = template.sample_rate / template.samples_per_frame
+        remaining = max(1, round(duration * frames_per_second))
+        per_chunk = max(1, round(chunk_seconds * frames_per_second))
+        while remaining > 0:
+            count = min(per_chunk, remaining)
+            yield frame * count
+            remaining -= count
+
+silence_bank = SilenceBank(build_header(TTS_OUTPUT_SAMPLE_RATE, TTS_OUTPUT_BITRATE, TTS_OUTPUT_CHANNELS))
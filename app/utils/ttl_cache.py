@@ -0,0 +1,108 @@
+# utils/ttl_cache.py
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry expiry; the building block of the
+    app's token, user, GPT response and TTS segment caches.
+
+    Each entry has a size (1 unless given) and an expiry time on `clock`.
+    Expired entries are dropped when looked up or on purge_expired(), and
+    least recently used entries go first once the total size passes
+    `max_size`. `on_evict(key, value)` runs for every entry that leaves.
+    """
+
+    def __init__(
+        self,
+        max_size: float,
+        ttl_seconds: float = math.inf,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (value, expires_at, size), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+        self._size = 0.0
+
+    def get(self, key: Hashable, record: bool = True) -> Optional[Any]:
+        """Value for `key`, or None. With record=False the caller counts the outcome via record()."""
+        entry = self._entries.get(key)
+        if entry and entry[1] > self.clock():
+            self._entries.move_to_end(key)
+            if record:
+                self.hits += 1
+            return entry[0]
+
+        if entry:
+            self.pop(key)
+        if record:
+            self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None, size: float = 1) -> None:
+        if expires_at is None:
+            expires_at = self.clock() + self.ttl_seconds
+        if expires_at <= self.clock():
+            self.pop(key)
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous:
+            self._size -= previous[2]
+        self._entries[key] = (value, expires_at, size)
+        self._size += size
+
+        while self._entries and self._size > self.max_size:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return None
+        self._size -= entry[2]
+        if self.on_evict:
+            self.on_evict(key, entry[0])
+        return entry[0]
+
+    def purge_expired(self) -> None:
+        now = self.clock()
+        for key in [k for k, (_, expires_at, _) in self._entries.items() if expires_at <= now]:
+            self.pop(key)
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def size(self) -> float:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
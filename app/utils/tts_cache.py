@@ -0,0 +1,105 @@
+# utils/tts_cache.py
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.utils.ttl_cache import TTLCache
+
+# elevenLabsSettings fields that change the rendered audio
+SETTINGS_KEY_FIELDS = ("model_id", "stability", "speed", "style")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class SegmentCache:
+    """
+    On-disk cache of synthesized TTS segments, content-addressed by
+    hash(voice_id, elevenLabsSettings, normalized text and its neighbours).
+
+    Entries are evicted least-recently-used first once the cache grows past
+    `max_bytes`, and unconditionally once older than `max_age_seconds`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_age_seconds: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+        # key -> file size in bytes; the file is removed whenever an entry leaves
+        self._entries = TTLCache(max_bytes, max_age_seconds, clock=time.time, on_evict=self._delete_file)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(
+        voice_id: str,
+        settings: Optional[Dict[str, Any]],
+        text: str,
+        previous_text: Optional[str] = None,
+        next_text: Optional[str] = None,
+    ) -> str:
+        settings = settings or {}
+        material = {
+            "voice_id": voice_id,
+            "settings": {field: settings.get(field) for field in SETTINGS_KEY_FIELDS},
+            "text": normalize_text(text),
+            # The neighbouring sentences sent to ElevenLabs shape the prosody too
+            "previous_text": normalize_text(previous_text) if previous_text else None,
+            "next_text": normalize_text(next_text) if next_text else None,
+        }
+        raw = json.dumps(material, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        found = self._entries.get(key, record=False) is not None
+        if found and not path.exists():
+            self._entries.pop(key)
+            found = False
+        self._entries.record(hit=found)
+        return path if found else None
+
+    def put(self, key: str, source: Path) -> Path:
+        """Move a freshly rendered file into the cache and return its cached path."""
+        target = self.path_for(key)
+        os.replace(source, target)  # atomic, so readers never see a partial file
+
+        size = target.stat().st_size
+        self._entries.purge_expired()
+        self._entries.put(key, size, size=size)
+        return target
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._entries.stats(), "bytes": int(self._entries.size)}
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+    def _load(self) -> None:
+        files = []
+        for path in self.directory.glob("*.mp3"):
+            st = path.stat()
+            files.append((st.st_atime, path.stem, st.st_size, st.st_mtime))
+
+        for _, key, size, stored_at in sorted(files):
+            self._entries.put(key, size, stored_at + self.max_age_seconds, size)
+            if key not in self._entries:
+                self._delete_file(key, size)  # already past max age
+
+    def _delete_file(self, key: str, _size: int) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
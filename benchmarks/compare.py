@@ -0,0 +1,92 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files (e.g. from two commits).
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Exits with status 1 when any p95/p99 latency grows, or throughput drops,
+by more than --threshold percent.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+Key = Tuple[str, str, int]
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def _key(result: Dict[str, Any]) -> Key:
+    return result["scenario"], json.dumps(result["params"], sort_keys=True), result["concurrency"]
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> Tuple[List[str], List[str]]:
+    lines: List[str] = []
+    regressions: List[str] = []
+
+    old_load = {_key(r): r for r in old.get("load", [])}
+    for result in new.get("load", []):
+        key = _key(result)
+        before = old_load.get(key)
+        if not before:
+            continue
+        name = f"{key[0]} {key[1]} c={key[2]}"
+        deltas = {
+            "rps": _change(before["throughput_rps"], result["throughput_rps"]),
+            "p50": _change(before["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+            "p95": _change(before["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+            "p99": _change(before["latency_ms"]["p99"], result["latency_ms"]["p99"]),
+        }
+        lines.append(
+            f"{name:<60} "
+            + "  ".join(f"{metric}={delta:+7.1f}%" for metric, delta in deltas.items())
+            + (f"  errors {before['errors']}→{result['errors']}" if result["errors"] != before["errors"] else "")
+        )
+        if deltas["rps"] < -threshold:
+            regressions.append(f"{name}: throughput {deltas['rps']:+.1f}%")
+        for metric in ("p95", "p99"):
+            if deltas[metric] > threshold:
+                regressions.append(f"{name}: {metric} {deltas[metric]:+.1f}%")
+
+    old_micro = {r["name"]: r for r in old.get("micro", [])}
+    for result in new.get("micro", []):
+        before = old_micro.get(result["name"])
+        if not before:
+            continue
+        delta = _change(before["best_us"], result["best_us"])
+        lines.append(f"{result['name']:<60} best={delta:+7.1f}%")
+        if delta > threshold:
+            regressions.append(f"{result['name']}: {delta:+.1f}% slower")
+
+    return lines, regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    old, new = _load(args.old), _load(args.new)
+    print(f"{old['meta']['commit']} ({old['meta']['timestamp']}) → {new['meta']['commit']} ({new['meta']['timestamp']})")
+    lines, regressions = compare(old, new, args.threshold)
+    print("\n".join(lines) or "No matching benchmark runs.")
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0f}%:")
+        print("\n".join(f"  - {r}" for r in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
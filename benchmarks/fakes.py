@@ -0,0 +1,185 @@
+# benchmarks/fakes.py
+"""
+Local stand-ins for everything the API talks to, so benchmarks run offline:
+in-memory Motor (mongomock_motor), fake ElevenLabs and OpenAI served through
+httpx.MockTransport with configurable latency, and Firebase token checks
+that accept "bench-token-<n>".
+"""
+import asyncio
+import json
+import sys
+import time
+import types
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+
+BENCH_VOICE_ID = "bench-voice"
+BENCH_TOKEN_PREFIX = "bench-token-"
+BENCH_UID_PREFIX = "bench-user-"
+
+
+# -----------------------------
+# 🔹 MongoDB
+# -----------------------------
+def install_fake_db() -> types.ModuleType:
+    """
+    Registers an in-memory replacement for app.db.db. Must run before anything
+    under app/ is imported, since modules bind the collections at import time.
+    """
+    client = AsyncMongoMockClient()
+    db = client["mme-mvp"]
+
+    module = types.ModuleType("app.db.db")
+    module.client = client
+    module.db = db
+    module.users_collection = db["users"]
+    module.answers_collection = db["answers"]
+    module.core_settings_collection = db["elevenLabsSettings"]
+    module.merge_jobs_collection = db["mergeJobs"]
+    module.gpt_cache_collection = db["gptResponseCache"]
+    # GridFS is only used by background merge jobs, which aren't benchmarked
+    module.merge_audio_bucket = None
+    sys.modules["app.db.db"] = module
+    return module
+
+
+async def seed_db(fake_db: types.ModuleType, users: int) -> None:
+    await fake_db.core_settings_collection.insert_one(
+        {
+            "_id": "singleton-settings",
+            "version": 1,
+            "elevenLabsSettings": {
+                "model_id": "eleven_multilingual_v2",
+                "stability": 0.5,
+                "speed": 1.0,
+                "style": 0.0,
+                "voiceTags": ["calm", "narration"],
+            },
+            "gptScriptStageOne": "Open with a warm greeting.",
+            "gptScriptStageTwo": "Close with a short summary.",
+            "demoAudioScript": "Welcome. (1s-pause) Let's begin.",
+        }
+    )
+    await fake_db.users_collection.insert_many(
+        [
+            {
+                "uid": f"{BENCH_UID_PREFIX}{i}",
+                "email": f"bench{i}@example.com",
+                "firstName": "Bench",
+                "lastName": f"User{i}",
+                "isGoogleUser": False,
+                "gender": "other",
+                "age": 30,
+                "password": "$2b$12$" + "x" * 53,
+            }
+            for i in range(users)
+        ]
+    )
+
+
+# -----------------------------
+# 🔹 Firebase
+# -----------------------------
+def install_fake_firebase() -> None:
+    """Default app with lazy credentials (never loaded) + token verification without RSA/network."""
+    import firebase_admin
+    from firebase_admin import auth as admin_auth
+
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(options={"projectId": "bench"})
+
+    def verify_id_token(token: str, *args, **kwargs) -> Dict[str, Any]:
+        if not token.startswith(BENCH_TOKEN_PREFIX):
+            raise ValueError("Unknown benchmark token")
+        now = int(time.time())
+        uid = BENCH_UID_PREFIX + token[len(BENCH_TOKEN_PREFIX):]
+        return {"uid": uid, "email": f"{uid}@example.com", "iat": now, "exp": now + 3600}
+
+    admin_auth.verify_id_token = verify_id_token
+
+
+def bench_token(i: int) -> str:
+    return f"{BENCH_TOKEN_PREFIX}{i}"
+
+
+# -----------------------------
+# 🔹 ElevenLabs
+# -----------------------------
+def fake_elevenlabs_transport(latency_ms: float, segment_seconds: float) -> httpx.MockTransport:
+    """Every TTS call returns the same valid MP3 (silent frames) after `latency_ms`."""
+    from app.utils.silence import silence_bank
+
+    audio = silence_bank.silence(segment_seconds)
+    voices = [
+        {
+            "voice_id": f"{BENCH_VOICE_ID}-{i}",
+            "name": f"Bench {i}",
+            "category": "premade" if i % 2 else "cloned",
+            "labels": {"gender": "female" if i % 2 else "male", "description": "calm" if i % 3 else "narration"},
+        }
+        for i in range(40)
+    ]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        if request.url.path.startswith("/v1/text-to-speech/"):
+            return httpx.Response(
+                200, content=audio, headers={"content-type": "audio/mpeg", "request-id": uuid.uuid4().hex}
+            )
+        if request.url.path == "/v1/voices":
+            return httpx.Response(200, json={"voices": voices})
+        return httpx.Response(404, json={"detail": "not found"})
+
+    return httpx.MockTransport(handler)
+
+
+# -----------------------------
+# 🔹 OpenAI
+# -----------------------------
+FAKE_SCRIPT = (
+    "Welcome to today's session. [Pause 1s] Take a slow breath in. (2s-pause) "
+    "And let it go. [Soft tone] Notice how your shoulders relax. [Pause 1s] "
+    "We'll begin when you're ready."
+)
+
+
+def _completion(content: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "bench",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _stream_events(content: str) -> List[bytes]:
+    events = []
+    for word in content.split(" "):
+        chunk = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "bench",
+            "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n".encode())
+    events.append(b"data: [DONE]\n\n")
+    return events
+
+
+def fake_openai_transport(latency_ms: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        body = json.loads(request.content or b"{}")
+        if body.get("stream"):
+            return httpx.Response(
+                200, content=b"".join(_stream_events(FAKE_SCRIPT)), headers={"content-type": "text/event-stream"}
+            )
+        return httpx.Response(200, json=_completion(FAKE_SCRIPT))
+
+    return httpx.MockTransport(handler)
@@ -0,0 +1,167 @@
+# benchmarks/harness.py
+"""
+Boots the real FastAPI app against the fakes in benchmarks/fakes.py and
+drives it in-process through httpx.ASGITransport (no sockets, so results
+reflect the app's own overhead plus the simulated upstream latency).
+"""
+import asyncio
+import math
+import os
+import statistics
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks import fakes
+
+
+@dataclass
+class BenchConfig:
+    users: int = 1000
+    eleven_latency_ms: float = 100.0
+    openai_latency_ms: float = 300.0
+    segment_seconds: float = 2.0
+    tts_cache: bool = False
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    requests: int
+    params: Dict[str, Any] = field(default_factory=dict)
+    body: Optional[Callable[[int], Dict[str, Any]]] = None  # request index → JSON body
+    authenticated: bool = True
+
+
+def configure_env(config: BenchConfig) -> None:
+    """Env read at import time by app modules; explicit env vars still win."""
+    defaults = {
+        "OPENAI_API_KEY": "bench",
+        "ELEVEN_API_KEY": "bench",
+        "LOG_LEVEL": "WARNING",
+        "INDEX_CHECK_MODE": "off",  # mongomock has no query planner
+        "GPT_CACHE_MONGO": "false",
+        "TTS_CACHE_ENABLED": "true" if config.tts_cache else "false",
+        # The per-voice limiter protects the real ElevenLabs quota; here every request shares one fake voice
+        "TTS_VOICE_RATE_PER_SECOND": "10000",
+        "TTS_VOICE_BURST": "10000",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+@asynccontextmanager
+async def running_app(config: BenchConfig) -> AsyncIterator[httpx.AsyncClient]:
+    configure_env(config)
+    fake_db = fakes.install_fake_db()
+    fakes.install_fake_firebase()
+
+    # Imported only now: app modules bind the DB collections and env settings at import time
+    from openai import AsyncOpenAI
+
+    import app.main as app_main
+    from app.db import indexes
+    from app.services import http_client, openai_service
+
+    # mongomock ignores partialFilterExpression, so a partial unique index would treat every
+    # document missing the field as a duplicate (e.g. all key-less form submissions of a user)
+    indexes.INDEXES = [
+        (collection, [model for model in models if "partialFilterExpression" not in model.document])
+        for collection, models in indexes.INDEXES
+    ]
+    real_ensure_indexes = app_main.ensure_indexes
+
+    async def ensure_indexes_best_effort():
+        try:
+            await real_ensure_indexes()
+        except Exception as e:
+            print(f"(index setup skipped on mongomock: {e})")
+
+    app_main.ensure_indexes = ensure_indexes_best_effort
+
+    # Pre-set the shared ElevenLabs client; the lifespan keeps an open client as is
+    http_client._client = httpx.AsyncClient(
+        transport=fakes.fake_elevenlabs_transport(config.eleven_latency_ms, config.segment_seconds)
+    )
+    openai_service.client = AsyncOpenAI(
+        api_key="bench",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=fakes.fake_openai_transport(config.openai_latency_ms)),
+    )
+
+    await fakes.seed_db(fake_db, config.users)
+
+    app = app_main.app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            yield client
+
+
+# -----------------------------
+# 🔹 Load runner
+# -----------------------------
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def _send(client: httpx.AsyncClient, scenario: Scenario, i: int, users: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {fakes.bench_token(i % users)}"} if scenario.authenticated else {}
+    body = scenario.body(i) if scenario.body else None
+    return await client.request(scenario.method, scenario.path, json=body, headers=headers)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, concurrency: int, users: int, warmup: int = 5
+) -> Dict[str, Any]:
+    for i in range(min(warmup, scenario.requests)):
+        await _send(client, scenario, i, users)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    indexes = iter(range(scenario.requests))
+
+    async def worker():
+        # One shared iterator: each request index is taken by exactly one worker
+        for i in indexes:
+            started = time.perf_counter()
+            try:
+                response = await _send(client, scenario, i, users)
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_started
+
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400)
+    return {
+        "scenario": scenario.name,
+        "params": scenario.params,
+        "concurrency": concurrency,
+        "requests": scenario.requests,
+        "errors": scenario.requests - ok,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "duration_s": round(wall, 4),
+        "throughput_rps": round(scenario.requests / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
@@ -0,0 +1,55 @@
+# benchmarks/micro.py
+"""Micro-benchmarks for the pure-CPU pieces of the hot paths (no app, no I/O)."""
+import statistics
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _cases() -> List[Tuple[str, Callable[[], Any]]]:
+    from app.core.token_cache import TokenCache
+    from app.utils.mp3 import join_mp3
+    from app.utils.script_parser import IncrementalScriptParser, parse_text_with_pauses
+    from app.utils.silence import silence_bank
+
+    long_script = " ".join(
+        ["Welcome to today's session. [Pause 1s] Take a slow breath in. (2s-pause) And let it go. [Soft tone]"] * 40
+    )
+    tokens = long_script.split(" ")
+    segment = silence_bank.silence(2.0)
+    segments = [segment] * 40
+
+    token_cache = TokenCache(10000, 300)
+    token_cache.put("bench-token", {"uid": "bench-user-0", "exp": 2**31})
+
+    def incremental_parse():
+        parser = IncrementalScriptParser(strip_cues=True)
+        for token in tokens:
+            parser.feed(token + " ")
+        parser.close()
+
+    return [
+        ("parse_text_with_pauses[long_script]", lambda: parse_text_with_pauses(long_script)),
+        ("incremental_parser[long_script]", incremental_parse),
+        ("join_mp3[40 segments]", lambda: join_mp3(segments)),
+        ("silence[2.5s]", lambda: silence_bank.silence(2.5)),
+        ("token_cache.get[hit]", lambda: token_cache.get("bench-token")),
+    ]
+
+
+def run_micro(repeat: int = 5) -> List[Dict[str, Any]]:
+    results = []
+    for name, fn in _cases():
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()  # enough loops for ≥0.2 s per repeat
+        per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+        best = min(per_call)
+        results.append(
+            {
+                "name": name,
+                "loops": number,
+                "best_us": round(best * 1e6, 3),
+                "median_us": round(statistics.median(per_call) * 1e6, 3),
+                "ops_per_sec": round(1 / best, 1) if best else 0.0,
+            }
+        )
+    return results
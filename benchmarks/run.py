@@ -0,0 +1,199 @@
+# benchmarks/run.py
+"""
+Offline load test + micro-benchmarks for the API's hot paths.
+
+    python -m benchmarks.run                                   # defaults, results → benchmarks/results/
+    python -m benchmarks.run --scenarios merge-audio --script-lengths 5,40 --concurrency 1,20
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Needs the app's dependencies plus mongomock-motor. Nothing leaves the machine:
+MongoDB, Firebase, ElevenLabs and OpenAI are all replaced by benchmarks/fakes.py.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.harness import BenchConfig, Scenario, run_scenario, running_app
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SCENARIOS = ("get-user", "submit-form", "chat", "merge-audio")
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return ""
+
+
+# -----------------------------
+# 🔹 Scenarios
+# -----------------------------
+def _answers(steps: int) -> List[Dict[str, Any]]:
+    return [
+        {"stepNumber": n, "stepTitle": f"Step {n}", "question": f"Question {n}?", "answer": f"Answer {n}"}
+        for n in range(1, steps + 1)
+    ]
+
+
+def _script(sentences: int, request: int) -> List[str]:
+    # Every other line carries a pause, like scripts produced by the GPT stage.
+    # The request index is part of each sentence, so the segment cache (if enabled) can't serve it.
+    return [
+        f"This is sentence {n} of benchmark request {request}." + (" (1s-pause)" if n % 2 else "")
+        for n in range(1, sentences + 1)
+    ]
+
+
+def build_scenarios(args: argparse.Namespace) -> List[Scenario]:
+    selected = set(args.scenarios)
+    scenarios: List[Scenario] = []
+
+    if "get-user" in selected:
+        scenarios.append(Scenario("get-user", "GET", "/api/get-user", args.requests))
+
+    if "submit-form" in selected:
+        answers = _answers(args.form_steps)
+        scenarios.append(
+            Scenario(
+                "submit-form", "POST", "/api/submit-form", args.requests,
+                params={"steps": args.form_steps},
+                body=lambda i: {"answers": answers},
+            )
+        )
+
+    if "chat" in selected:
+        # noCache → every request reaches the (fake) OpenAI endpoint; cached → response cache hits
+        scenarios.append(
+            Scenario(
+                "chat", "POST", "/api/chat", args.requests,
+                params={"cache": False},
+                body=lambda i: {"message": f"Write a calm intro #{i}", "noCache": True},
+                authenticated=False,
+            )
+        )
+        scenarios.append(
+            Scenario(
+                "chat", "POST", "/api/chat", args.requests,
+                params={"cache": True},
+                body=lambda i: {"message": "Write a calm intro"},
+                authenticated=False,
+            )
+        )
+
+    if "merge-audio" in selected:
+        for length in args.script_lengths:
+            scenarios.append(
+                Scenario(
+                    "merge-audio", "POST", "/api/merge-audio", args.merge_requests,
+                    params={"sentences": length, "stream": args.stream},
+                    body=lambda i, n=length: {
+                        "voiceId": "bench-voice",
+                        "sentences": _script(n, i),
+                        "stream": args.stream,
+                    },
+                )
+            )
+    return scenarios
+
+
+# -----------------------------
+# 🔹 Main
+# -----------------------------
+async def run_load(args: argparse.Namespace, config: BenchConfig) -> List[Dict[str, Any]]:
+    results = []
+    async with running_app(config) as client:
+        for scenario in build_scenarios(args):
+            for concurrency in args.concurrency:
+                result = await run_scenario(client, scenario, concurrency, config.users)
+                results.append(result)
+                lat = result["latency_ms"]
+                print(
+                    f"{scenario.name:<12} {json.dumps(scenario.params):<34} c={concurrency:<4} "
+                    f"{result['throughput_rps']:>9.1f} req/s  p50={lat['p50']:>9.2f}ms  "
+                    f"p95={lat['p95']:>9.2f}ms  p99={lat['p99']:>9.2f}ms  errors={result['errors']}"
+                    + (f"  ← FAILED REQUESTS {result['statuses']}" if result["errors"] else "")
+                )
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=_ints, default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="requests per get-user/submit-form/chat run")
+    parser.add_argument("--merge-requests", type=int, default=40, help="requests per merge-audio run")
+    parser.add_argument("--script-lengths", type=_ints, default=[1, 10, 40], help="sentences per merge-audio script")
+    parser.add_argument("--form-steps", type=int, default=10)
+    parser.add_argument("--stream", action="store_true", help="use streamed merge-audio responses")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--eleven-latency-ms", type=float, default=100.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=300.0)
+    parser.add_argument("--tts-cache", action="store_true", help="keep the on-disk TTS segment cache enabled")
+    parser.add_argument("--no-micro", action="store_true", help="skip the micro-benchmarks")
+    parser.add_argument("--label", default="", help="free-form tag stored with the results")
+    parser.add_argument("--output", type=Path, default=None, help="results file (default: benchmarks/results/...)")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    config = BenchConfig(
+        users=args.users,
+        eleven_latency_ms=args.eleven_latency_ms,
+        openai_latency_ms=args.openai_latency_ms,
+        tts_cache=args.tts_cache,
+    )
+
+    load_results = asyncio.run(run_load(args, config))
+
+    micro_results = []
+    if not args.no_micro:
+        from benchmarks.micro import run_micro
+
+        micro_results = run_micro()
+        for result in micro_results:
+            print(f"{result['name']:<40} {result['best_us']:>12.3f} µs  ({result['ops_per_sec']:.0f} ops/s)")
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    started = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "label": args.label,
+            "timestamp": started.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": {**vars(config), "stream": args.stream, "form_steps": args.form_steps},
+        },
+        "load": load_results,
+        "micro": micro_results,
+    }
+
+    output = args.output or RESULTS_DIR / f"{started:%Y%m%dT%H%M%S}_{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    failed = [r for r in load_results if r["errors"]]
+    if failed:
+        # Latencies of error responses aren't a measurement of the scenario
+        print(f"\n{len(failed)} run(s) had failed requests; their numbers are not comparable.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# tests/test_tts_service.py
+import asyncio
+from pathlib import Path
+
+from app.services import tts_service
+from app.utils.mp3 import iter_frames
+from app.utils.silence import silence_bank
+from app.utils.tts_cache import SegmentCache
+from app.utils.ttl_cache import TTLCache
+
+SEGMENT = silence_bank.silence(2.0)  # ~32 KB at 128 kbps
+
+
+def test_merge_larger_than_segment_cache(tmp_path: Path, monkeypatch):
+    # Each new segment evicts the previous ones, so the merge must not rely on cached files surviving
+    cache = SegmentCache(tmp_path / "cache", max_bytes=len(SEGMENT), max_age_seconds=3600)
+    monkeypatch.setattr(tts_service, "segment_cache", cache)
+    monkeypatch.setattr(tts_service, "TTS_VOICE_RATE_PER_SECOND", 0)
+    monkeypatch.setattr(tts_service, "_voice_limiters", TTLCache(1000))
+
+    async def fake_generate_audio(text, output_path, voice_id, previous_text=None, next_text=None):
+        await asyncio.sleep(0)
+        Path(output_path).write_bytes(SEGMENT)
+        return {"request_id": f"req-{text}"}
+
+    monkeypatch.setattr(tts_service, "generate_audio", fake_generate_audio)
+
+    chunks = [{"type": "text", "sentence": f"Sentence {i}."} for i in range(40)]
+    audio, request_ids = asyncio.run(tts_service.render_merged_audio(chunks, "voice", tmp_path))
+
+    assert len(request_ids) == 40
+    assert cache.stats()["bytes"] <= len(SEGMENT)
+    frames_per_segment = sum(1 for _ in iter_frames(SEGMENT))
+    assert sum(1 for _ in iter_frames(audio)) >= 40 * frames_per_segment
+    assert not list(tmp_path.glob("tts_*.mp3"))